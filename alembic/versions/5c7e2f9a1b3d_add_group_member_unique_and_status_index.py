@@ -0,0 +1,45 @@
+"""Add a unique membership constraint and a group/status index on group members
+
+Revision ID: 5c7e2f9a1b3d
+Revises: b41e9a6c2d17
+Create Date: 2026-10-16 14:21:05.316742
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c7e2f9a1b3d'
+down_revision: Union[str, None] = 'b41e9a6c2d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Check-then-insert races could store the same membership twice. Keep one row per
+    # (user_id, group_id) pair so the constraint can be created, preferring a manager
+    # row, then an active one, then the oldest, so no group loses its real membership
+    op.execute(
+        sa.text(
+            "DELETE FROM group_members WHERE id IN ("
+            "SELECT id FROM ("
+            "SELECT id, ROW_NUMBER() OVER ("
+            "PARTITION BY user_id, group_id "
+            "ORDER BY CASE WHEN role = 'manager' THEN 0 ELSE 1 END, "
+            "CASE WHEN status = 'active' THEN 0 ELSE 1 END, id"
+            ") AS rn FROM group_members"
+            ") ranked WHERE rn > 1)"
+        )
+    )
+    op.create_index('ix_group_members_group_id_status', 'group_members', ['group_id', 'status'])
+    with op.batch_alter_table('group_members') as batch_op:
+        batch_op.create_unique_constraint('uq_group_members_user_id_group_id', ['user_id', 'group_id'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('group_members') as batch_op:
+        batch_op.drop_constraint('uq_group_members_user_id_group_id', type_='unique')
+    op.drop_index('ix_group_members_group_id_status', table_name='group_members')
@@ -0,0 +1,32 @@
+"""Add composite indexes for expenses and group debts
+
+Revision ID: 8f2c1d7e4a90
+Revises: 3d4bd7a9004c
+Create Date: 2026-10-16 09:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2c1d7e4a90'
+down_revision: Union[str, None] = '3d4bd7a9004c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_expenses_user_id_category_id', 'expenses', ['user_id', 'category_id'])
+    op.create_index('ix_expenses_user_id_date', 'expenses', ['user_id', 'date'])
+    op.create_index('ix_group_debts_debtor_id_status', 'group_debts', ['debtor_id', 'status'])
+    op.create_index('ix_group_debts_creditor_id_status', 'group_debts', ['creditor_id', 'status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_group_debts_creditor_id_status', table_name='group_debts')
+    op.drop_index('ix_group_debts_debtor_id_status', table_name='group_debts')
+    op.drop_index('ix_expenses_user_id_date', table_name='expenses')
+    op.drop_index('ix_expenses_user_id_category_id', table_name='expenses')
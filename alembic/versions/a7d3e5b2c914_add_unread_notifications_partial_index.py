@@ -0,0 +1,32 @@
+"""Add a partial index over unread notifications
+
+Revision ID: a7d3e5b2c914
+Revises: e3a91c4d7f20
+Create Date: 2026-10-16 15:48:12.204377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e5b2c914'
+down_revision: Union[str, None] = 'e3a91c4d7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_notifications_user_id_unread',
+        'notifications',
+        ['user_id', 'id'],
+        postgresql_where=sa.text('is_read IS false'),
+        sqlite_where=sa.text('is_read IS 0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_user_id_unread', table_name='notifications')
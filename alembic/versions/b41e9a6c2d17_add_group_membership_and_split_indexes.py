@@ -0,0 +1,30 @@
+"""Add indexes for group membership checks, expense splits and group debts
+
+Revision ID: b41e9a6c2d17
+Revises: 8f2c1d7e4a90
+Create Date: 2026-10-16 11:03:27.918455
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41e9a6c2d17'
+down_revision: Union[str, None] = '8f2c1d7e4a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_group_members_user_id_group_id_status', 'group_members', ['user_id', 'group_id', 'status'])
+    op.create_index(op.f('ix_expense_splits_expense_id'), 'expense_splits', ['expense_id'])
+    op.create_index('ix_group_debts_debtor_id_group_id_status', 'group_debts', ['debtor_id', 'group_id', 'status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_group_debts_debtor_id_group_id_status', table_name='group_debts')
+    op.drop_index(op.f('ix_expense_splits_expense_id'), table_name='expense_splits')
+    op.drop_index('ix_group_members_user_id_group_id_status', table_name='group_members')
@@ -0,0 +1,49 @@
+"""Rebuild the unread notifications partial index without INCLUDE columns
+
+Revision ID: c5f1b8e3d402
+Revises: a7d3e5b2c914
+Create Date: 2026-10-16 17:58:41.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5f1b8e3d402'
+down_revision: Union[str, None] = 'a7d3e5b2c914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # An earlier version of this revision added INCLUDE (type, message, is_read, created_at)
+    # on PostgreSQL, which fails inserts of long messages. Only PostgreSQL ever had it.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # Build the replacement under a temporary name and swap it in, so the table keeps an
+    # equivalent index throughout and a failed build never replaces the working one
+    with op.get_context().autocommit_block():
+        # Clear an INVALID index left behind by a previously failed build
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_notifications_user_id_unread_new')
+        op.create_index(
+            'ix_notifications_user_id_unread_new',
+            'notifications',
+            ['user_id', 'id'],
+            postgresql_where=sa.text('is_read IS false'),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_notifications_user_id_unread',
+            table_name='notifications',
+            postgresql_concurrently=True,
+        )
+        op.execute('ALTER INDEX ix_notifications_user_id_unread_new RENAME TO ix_notifications_user_id_unread')
+
+
+def downgrade() -> None:
+    # The rebuilt index has the same definition as the one created by a7d3e5b2c914
+    pass
@@ -0,0 +1,49 @@
+"""Store group member role and status as enums
+
+Revision ID: e3a91c4d7f20
+Revises: 5c7e2f9a1b3d
+Create Date: 2026-10-16 15:02:44.581930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a91c4d7f20'
+down_revision: Union[str, None] = '5c7e2f9a1b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+group_member_role = sa.Enum('member', 'manager', name='group_member_role')
+group_member_status = sa.Enum('pending', 'active', 'rejected', name='group_member_status')
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    group_member_role.create(bind, checkfirst=True)
+    group_member_status.create(bind, checkfirst=True)
+    with op.batch_alter_table('group_members') as batch_op:
+        batch_op.alter_column(
+            'role',
+            existing_type=sa.String(),
+            type_=group_member_role,
+            postgresql_using='role::group_member_role',
+        )
+        batch_op.alter_column(
+            'status',
+            existing_type=sa.String(),
+            type_=group_member_status,
+            postgresql_using='status::group_member_status',
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('group_members') as batch_op:
+        batch_op.alter_column('status', existing_type=group_member_status, type_=sa.String())
+        batch_op.alter_column('role', existing_type=group_member_role, type_=sa.String())
+    bind = op.get_bind()
+    group_member_status.drop(bind, checkfirst=True)
+    group_member_role.drop(bind, checkfirst=True)
@@ -1,3 +1,8 @@
 from .budget_monitoring import check_and_deactivate_expired_budgets
 from .notification_cleanup import delete_old_notifications
-from .threshold_checks import check_budget, check_category_budget
\ No newline at end of file
+from .threshold_checks import check_budget, check_category_budget, queue_budget_checks
+from .debt_notifications import notify_debtors
+from .group_notifications import notify_group_invitation
+from .notification_batches import create_or_add_to_user_notification_batch, flush_notification_batches
+
+from .pool_monitoring import log_pool_status
\ No newline at end of file
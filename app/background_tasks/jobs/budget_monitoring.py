@@ -26,15 +26,15 @@ def check_and_deactivate_expired_budgets():
 
                 # Send a notification to the user informing them that their budget was deactivated
                 message = f"Your budget (ID: {budget.id}) has been deactivated because its end date has passed."
-                existing_notification = (
+                existing_notification = db.query(
                     db.query(Notification)
                     .filter(
                         Notification.user_id == budget.user_id,
                         Notification.message == message,
                         Notification.is_read == False,
                     )
-                    .first()
-                )
+                    .exists()
+                ).scalar()
 
                 # Only create a new notification if there are no unread ones with the same message
                 if not existing_notification:
@@ -0,0 +1,46 @@
+from sqlalchemy import insert
+from app.database import SessionLocal
+from app.models import Notification, NotificationType
+from app.utils import logger, invalidate_unread_notifications_cache
+
+
+def notify_debtors(payer_username: str, description: str, debts: list[tuple[int, float]]):
+    """
+    Background task to notify the debtors of a newly split group expense.
+
+    Args: \n
+        payer_username (str): The username of the member who paid the expense.
+        description (str): The description of the group expense.
+        debts (list[tuple[int, float]]): The (debtor ID, amount owed) pairs to notify.
+    """
+    # Only the amount varies between debtors, so build the rest of the message once
+    message_prefix = f"You owe {payer_username} "
+    message_suffix = f" for '{description}'"
+
+    db = SessionLocal()
+    try:
+        db.execute(
+            insert(Notification),
+            [
+                {
+                    "user_id": debtor_id,
+                    "type": NotificationType.GROUP_DEBT,
+                    "message": message_prefix + str(amount) + message_suffix,
+                }
+                for debtor_id, amount in debts
+            ],
+        )
+        db.commit()
+        invalidate_unread_notifications_cache(*(debtor_id for debtor_id, _ in debts))
+        logger.info(
+            "Sent %s debt notifications for group expense '%s'",
+            len(debts),
+            description,
+        )
+    except Exception as e:
+        logger.error(
+            "Error occurred while sending debt notifications: %s",
+            e,
+        )
+    finally:
+        db.close()
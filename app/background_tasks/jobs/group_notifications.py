@@ -0,0 +1,62 @@
+from sqlalchemy import insert
+from app.database import SessionLocal
+from app.models import Notification, NotificationType
+from app.utils import logger, invalidate_unread_notifications_cache
+from .notification_batches import create_or_add_to_user_notification_batch
+
+
+def notify_group_invitation(
+    group_name: str,
+    manager_id: int,
+    manager_username: str,
+    invitee_id: int,
+    invitee_username: str,
+):
+    """
+    Background task to notify the invited user and the inviting manager of a group invitation.
+    The invitation itself is stored right away since the invitee has to act on it; the
+    manager's informational confirmation is coalesced into a per-user batch when batching
+    is available.
+
+    Args: \n
+        group_name (str): The name of the group the user was invited to.
+        manager_id (int): The ID of the manager who sent the invitation.
+        manager_username (str): The username of the manager who sent the invitation.
+        invitee_id (int): The ID of the invited user.
+        invitee_username (str): The username of the invited user.
+    """
+    notifications = [
+        {
+            "user_id": invitee_id,
+            "type": NotificationType.ALERT,
+            "message": f"You've been invited to join group '{group_name}' by '{manager_username}'. Please accept or reject the invitation."
+        },
+    ]
+    confirmation = f"You've invited '{invitee_username}' to join group '{group_name}'."
+    # Store the confirmation with the invitation when it could not be added to a batch
+    if not create_or_add_to_user_notification_batch(manager_id, NotificationType.ALERT, confirmation):
+        notifications.append(
+            {
+                "user_id": manager_id,
+                "type": NotificationType.ALERT,
+                "message": confirmation,
+            }
+        )
+
+    db = SessionLocal()
+    try:
+        db.execute(insert(Notification), notifications)
+        db.commit()
+        invalidate_unread_notifications_cache(*(notification["user_id"] for notification in notifications))
+        logger.info(
+            "Sent invitation notifications for group '%s' to user ID: %s",
+            group_name,
+            invitee_id,
+        )
+    except Exception as e:
+        logger.error(
+            "Error occurred while sending group invitation notifications: %s",
+            e,
+        )
+    finally:
+        db.close()
@@ -0,0 +1,166 @@
+import redis
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from app.database import SessionLocal
+from app.models import Notification, NotificationType
+from app.utils import logger, invalidate_unread_notifications_cache
+from app.utils.cache import redis_client
+
+# How long (in seconds) a batch stays open to collect events before it is flushed
+NOTIFICATION_BATCH_WINDOW = 30
+
+# Merged messages are cut to this many characters so a busy batch stays readable
+NOTIFICATION_BATCH_MAX_MESSAGE_LENGTH = 1000
+
+# Set of all batch keys that have not been flushed yet
+_BATCH_INDEX_KEY = "notification_batches"
+
+
+def _batch_key(user_id: int, type: NotificationType) -> str:
+    return f"notification_batch:{user_id}:{type.value}"
+
+
+def _batch_open_key(batch_key: str) -> str:
+    return f"{batch_key}:open"
+
+
+def _batch_claim_key(batch_key: str) -> str:
+    return f"{batch_key}:flushing"
+
+
+def _batch_message(events: list[str]) -> str:
+    if len(events) == 1:
+        message = events[0]
+    else:
+        message = f"You have {len(events)} new notifications: " + " | ".join(events)
+    if len(message) > NOTIFICATION_BATCH_MAX_MESSAGE_LENGTH:
+        message = message[:NOTIFICATION_BATCH_MAX_MESSAGE_LENGTH - 3] + "..."
+    return message
+
+
+def create_or_add_to_user_notification_batch(user_id: int, type: NotificationType, event: str) -> bool:
+    """
+    Adds a notification message to the user's open batch for the given type,
+    opening a new batch when there is none. Only use this for informational
+    notifications; batched messages are merged and delivered up to two batch
+    windows late.
+
+    Args: \n
+        user_id (int): The ID of the user to notify.
+        type (NotificationType): The type of the notification.
+        event (str): The notification message.
+
+    Returns:
+        bool: False when batching is unavailable and the caller must store the notification itself.
+    """
+    if redis_client is None:
+        return False
+    key = _batch_key(user_id, type)
+    try:
+        pipe = redis_client.pipeline()
+        pipe.rpush(key, event)
+        # The marker only exists for the first event's window; later events join the same batch
+        pipe.set(_batch_open_key(key), 1, ex=NOTIFICATION_BATCH_WINDOW, nx=True)
+        pipe.sadd(_BATCH_INDEX_KEY, key)
+        pipe.execute()
+        return True
+    except redis.RedisError as e:
+        logger.warning(
+            "Failed to batch notification for user ID: %s: %s",
+            user_id,
+            e,
+        )
+        return False
+
+
+def _drop_flushed_events(key: str, count: int):
+    """
+    Removes the first `count` events of a flushed batch, keeping any events added
+    since it was read, and unindexes the batch once it is empty.
+    """
+    def trim(pipe):
+        remaining = pipe.llen(key) - count
+        pipe.multi()
+        pipe.ltrim(key, count, -1)
+        if remaining <= 0:
+            pipe.srem(_BATCH_INDEX_KEY, key)
+
+    # Retried by redis-py if an event is added to the batch while trimming
+    redis_client.transaction(trim, key)
+
+
+def flush_notification_batches():
+    """
+    Stores every batch whose window has elapsed as a single notification.
+    Each batch is claimed before it is read, so concurrent flushers never store it
+    twice, and committed on its own, so one failing batch does not hold back the
+    others. A batch is only removed from Redis after its notification is committed
+    and is retried on the next run, unless it can never be stored (e.g. the user
+    was deleted), in which case it is dropped.
+    """
+    if redis_client is None:
+        return
+    db = SessionLocal()
+    flushed_user_ids = []
+    try:
+        for key in redis_client.smembers(_BATCH_INDEX_KEY):
+            key = key.decode()
+            if redis_client.exists(_batch_open_key(key)):
+                continue
+            # Expires on its own if this flusher dies before releasing it
+            claim_key = _batch_claim_key(key)
+            if not redis_client.set(claim_key, 1, ex=NOTIFICATION_BATCH_WINDOW * 2, nx=True):
+                continue
+
+            try:
+                events = [event.decode() for event in redis_client.lrange(key, 0, -1)]
+                if not events:
+                    _drop_flushed_events(key, 0)
+                    continue
+
+                _, user_id, type_value = key.rsplit(":", 2)
+                try:
+                    db.execute(
+                        insert(Notification),
+                        {
+                            "user_id": int(user_id),
+                            "type": NotificationType(type_value),
+                            "message": _batch_message(events),
+                        },
+                    )
+                    db.commit()
+                except IntegrityError as e:
+                    db.rollback()
+                    logger.error(
+                        "Dropping notification batch %s that cannot be stored: %s",
+                        key,
+                        e,
+                    )
+                    _drop_flushed_events(key, len(events))
+                    continue
+                except Exception as e:
+                    db.rollback()
+                    logger.error(
+                        "Error occurred while flushing notification batch %s: %s",
+                        key,
+                        e,
+                    )
+                    continue
+
+                _drop_flushed_events(key, len(events))
+                flushed_user_ids.append(int(user_id))
+            finally:
+                redis_client.delete(claim_key)
+    except Exception as e:
+        logger.error(
+            "Error occurred while flushing notification batches: %s",
+            e,
+        )
+    finally:
+        db.close()
+        if flushed_user_ids:
+            invalidate_unread_notifications_cache(*flushed_user_ids)
+            logger.info(
+                "Flushed %s notification batches.",
+                len(flushed_user_ids),
+            )
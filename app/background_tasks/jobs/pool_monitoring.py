@@ -0,0 +1,18 @@
+from app.config import settings
+from app.database import engine
+from app.utils import logger
+
+
+def log_pool_status():
+    """
+    Logs the database connection pool usage, warning when every connection is checked out
+    so leaked or long-held connections show up before requests start timing out.
+    """
+    if engine.dialect.name == "sqlite":
+        return  # SQLite keeps its default pool, which is not sized by the DB_POOL_* settings
+
+    pool = engine.pool
+    if pool.checkedout() >= settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW:
+        logger.warning("Database connection pool exhausted: %s", pool.status())
+    else:
+        logger.info("Database connection pool status: %s", pool.status())
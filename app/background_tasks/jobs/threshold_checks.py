@@ -1,3 +1,6 @@
+import threading
+import time
+from fastapi import BackgroundTasks
 from app.database import SessionLocal
 from app.models import Expense, GeneralBudget, CategoryBudget, Category
 from app.models import Notification, NotificationType
@@ -5,6 +8,49 @@ from app.websocket_manager import manager
 from app.utils import logger
 from app.utils import send_notification
 
+# Users with budget checks queued but not yet started, mapped to when they were
+# queued, so a burst of expenses from the same user coalesces into a single round
+# of checks
+_pending_budget_checks: dict[int, float] = {}
+_pending_budget_checks_lock = threading.Lock()
+# Seconds after which a queued check that never started (e.g. the client
+# disconnected before the background tasks ran) no longer suppresses new ones
+PENDING_BUDGET_CHECK_TTL = 5
+
+
+def queue_budget_checks(background_tasks: BackgroundTasks, user_id: int):
+    """
+    Queues the general and category budget checks for a user, unless checks for
+    that user were queued less than `PENDING_BUDGET_CHECK_TTL` seconds ago and
+    have not started yet.
+
+    Args: \n
+        background_tasks (BackgroundTasks): The request's background task queue.
+        user_id (int): The ID of the user whose budgets should be checked.
+    """
+    now = time.monotonic()
+    with _pending_budget_checks_lock:
+        queued_at = _pending_budget_checks.get(user_id)
+        if queued_at is not None and now - queued_at < PENDING_BUDGET_CHECK_TTL:
+            return
+        _pending_budget_checks[user_id] = now
+    background_tasks.add_task(run_budget_checks, user_id)
+
+
+async def run_budget_checks(user_id: int):
+    """
+    Runs the general and category budget checks queued by `queue_budget_checks`.
+
+    Args: \n
+        user_id (int): The ID of the user whose budgets are being checked.
+    """
+    # Clear the pending flag before reading any expenses, so an expense committed
+    # while these checks run queues a fresh round instead of being skipped
+    with _pending_budget_checks_lock:
+        _pending_budget_checks.pop(user_id, None)
+    await check_budget(user_id)
+    await check_category_budget(user_id)
+
 
 # Background task to check thresholds
 async def check_budget(user_id: int):
@@ -54,15 +100,15 @@ async def check_budget(user_id: int):
                 f"GeneralBudget exceeded for user ID {user_id}. Exceedance amount: {abs(remaining_amount)}"
             )
             message = f"You've exceeded your budget of {budget.amount_limit} by {abs(remaining_amount)}."
-            existing_notification = (
+            existing_notification = db.query(
                 db.query(Notification)
                 .filter(
                     Notification.user_id == user_id,
                     Notification.message == message,
                     Notification.is_read == False,
                 )
-                .first()
-            )
+                .exists()
+            ).scalar()
 
             # Create a new notification if not already present
             if not existing_notification:
@@ -129,15 +175,15 @@ async def check_category_budget(user_id: int):
                     f"by {exceed_amount:.2f}. Your limit was {budget.amount_limit}."
                 )
 
-                existing_notification = (
+                existing_notification = db.query(
                     db.query(Notification)
                     .filter(
                         Notification.user_id == user_id,
                         Notification.message == message,
                         Notification.is_read == False,
                     )
-                    .first()
-                )
+                    .exists()
+                ).scalar()
                 if not existing_notification:
                     send_notification(
                         db=db, 
@@ -1,6 +1,7 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from app.background_tasks import delete_old_notifications, check_and_deactivate_expired_budgets, check_budget, check_category_budget
+from app.background_tasks import delete_old_notifications, check_and_deactivate_expired_budgets, check_budget, check_category_budget, flush_notification_batches, log_pool_status
+from app.background_tasks.jobs.notification_batches import NOTIFICATION_BATCH_WINDOW
 from app.database import SessionLocal
 from app.models import User
 from asgiref.sync import async_to_sync
@@ -12,6 +13,8 @@ def start_scheduler():
     scheduler.add_job(delete_old_notifications, IntervalTrigger(days=1))
     scheduler.add_job(check_and_deactivate_expired_budgets, IntervalTrigger(minutes=5))
     scheduler.add_job(async_to_sync(check_all_thresholds), IntervalTrigger(minutes=5))
+    scheduler.add_job(flush_notification_batches, IntervalTrigger(seconds=NOTIFICATION_BATCH_WINDOW))
+    scheduler.add_job(log_pool_status, IntervalTrigger(minutes=1))
 
     # Start the scheduler
     scheduler.start()
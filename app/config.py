@@ -18,6 +18,19 @@ class Settings(BaseSettings):
     # Comment this to use a PostgreSQL database
     # DATABASE_URL: str = 'sqlite:///expense.db'
 
+    # Connection pool sizing (not used with SQLite)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 20))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))  # Seconds before a connection is replaced
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", 30))  # Seconds to wait for a free connection
+
+    # Worker threads for the sync routes; defaults to the connection pool capacity plus
+    # some headroom for routes that do not touch the database
+    THREADPOOL_SIZE: int = int(os.getenv("THREADPOOL_SIZE", DB_POOL_SIZE + DB_MAX_OVERFLOW + 10))
+
+    # Optional Redis cache, e.g. redis://localhost:6379/0 (caching is disabled when unset)
+    REDIS_URL: str | None = os.getenv("REDIS_URL")
+
     # Admin Master Key
     MASTER_KEY: str = os.getenv("MASTER_KEY", "master_key")
 
@@ -1,16 +1,39 @@
 # app/database.py
 
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import settings
 
 DATABASE_URL = settings.DATABASE_URL
 
-# Create the database engine
-engine = create_engine(DATABASE_URL)
+# Explicit QueuePool sizing for server databases: routes run in the threadpool and each
+# holds a connection for a few short queries, so keep enough pooled connections for
+# concurrent requests, ping them on checkout, recycle them before the server drops
+# idle ones and give up after DB_POOL_TIMEOUT seconds when the pool is exhausted.
+# SQLite uses its own pool and ignores these options.
+pool_options = (
+    {}
+    if DATABASE_URL.startswith("sqlite")
+    else {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+)
 
-# Create a session local for handling database sessions
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create the database engine, with a larger compiled-statement cache so the
+# hot parameterized queries in the routers are not recompiled per request
+engine = create_engine(DATABASE_URL, query_cache_size=1200, **pool_options)
+
+# Dialect-specific INSERT construct, for statements that need ON CONFLICT clauses
+insert_on_conflict = postgresql.insert if engine.dialect.name == "postgresql" else sqlite.insert
+
+# Create a session local for handling database sessions. Instances are not
+# expired on commit, so routes can return committed objects without a refresh
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Base class for declarative models
 Base = declarative_base()
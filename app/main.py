@@ -7,9 +7,10 @@ from fastapi import (
     Request
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from contextlib import asynccontextmanager
 import asyncio
+import anyio
 from app.websocket_manager import manager
 from app.background_tasks import scheduler, start_scheduler
 from app.database import engine, Base
@@ -28,6 +29,7 @@ from app.routers import (
     profile_router,
     category_budgets_router,
 )
+from app.routers.google_auth import http_client
 from app.utils import logger
 import sentry_sdk
 
@@ -49,6 +51,8 @@ sentry_sdk.init(
 async def lifespan(app: FastAPI):
     """Manage application lifespan events."""
     print("Starting up the application...")
+    # Sync routes and dependencies run in anyio's worker threads; size that pool explicitly
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
     start_scheduler()
     asyncio.create_task(manager.keep_alive())
     try:
@@ -56,6 +60,7 @@ async def lifespan(app: FastAPI):
     finally:
         print("Shutting down the application...")
         scheduler.shutdown()
+        await http_client.aclose()
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -63,6 +68,7 @@ app = FastAPI(
     version="1.0.0",
     debug=settings.DEBUG,  # Enable debug mode if in development
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # Serialize JSON responses with orjson
 )
 
 # CORS settings
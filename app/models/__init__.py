@@ -8,5 +8,5 @@ from .notification import Notification, NotificationType
 from .expense_split import ExpenseSplit
 from .group import Group
 from .group_expense import GroupExpense
-from .group_member import GroupMember
+from .group_member import GroupMember, GroupMemberRole, GroupMemberState
 from .group_debt import GroupDebt
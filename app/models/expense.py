@@ -1,6 +1,6 @@
 # app/models/expense.py
 
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import datetime
@@ -32,6 +32,12 @@ class Expense(Base):
     user_id = Column(Integer, ForeignKey("users.id"), index=True)
     category_id = Column(Integer, ForeignKey("categories.id"))  # Link to category
 
+    # Composite indexes for the per-user filters used by the expense routes
+    __table_args__ = (
+        Index("ix_expenses_user_id_category_id", "user_id", "category_id"),
+        Index("ix_expenses_user_id_date", "user_id", "date"),
+    )
+
     # Relationship back to the user
     owner = relationship("User", back_populates="expenses")
 
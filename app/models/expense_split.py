@@ -8,7 +8,7 @@ class ExpenseSplit(Base):
     __tablename__ = "expense_splits"
     
     id = Column(Integer, primary_key=True, index=True)
-    expense_id = Column(Integer, ForeignKey("group_expenses.id"))
+    expense_id = Column(Integer, ForeignKey("group_expenses.id"), index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     amount = Column(Float, nullable=False)
     
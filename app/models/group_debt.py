@@ -1,6 +1,6 @@
 # app/models/group_debt.py
 
-from sqlalchemy import Column, Integer, ForeignKey, Float, String, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, Float, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -34,6 +34,15 @@ class GroupDebt(Base):
     due_date = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=func.now())
 
+    # Composite indexes for the debtor/creditor listings filtered by status
+    __table_args__ = (
+        Index("ix_group_debts_debtor_id_status", "debtor_id", "status"),
+        Index("ix_group_debts_creditor_id_status", "creditor_id", "status"),
+        Index("ix_group_debts_debtor_id_group_id_status", "debtor_id", "group_id", "status"),
+    )
+    # Fetch created_at in the INSERT itself so new debts need no refresh
+    __mapper_args__ = {"eager_defaults": True}
+
     # Relationships
     group = relationship("Group", back_populates="group_debts")
     debtor = relationship("User", foreign_keys=[debtor_id])
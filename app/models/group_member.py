@@ -1,8 +1,18 @@
 # app/models/group_member.py
 
-from sqlalchemy import Column, Integer, ForeignKey, String
+from sqlalchemy import Column, Integer, ForeignKey, Index, UniqueConstraint, Enum
 from sqlalchemy.orm import relationship
 from app.database import Base
+import enum
+
+class GroupMemberRole(str, enum.Enum):
+    MEMBER = "member"
+    MANAGER = "manager"
+
+class GroupMemberState(str, enum.Enum):
+    PENDING = "pending"
+    ACTIVE = "active"
+    REJECTED = "rejected"
 
 class GroupMember(Base):
     __tablename__ = "group_members"
@@ -10,8 +20,23 @@ class GroupMember(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     group_id = Column(Integer, ForeignKey("groups.id"))
-    role = Column(String, default="member")  # e.g., 'manager'
-    status = Column(String, default="active")  # 'active' or 'pending'
+    # Stored as native enums (by value) so membership filters compare compact enum values
+    role = Column(
+        Enum(GroupMemberRole, name="group_member_role", values_callable=lambda e: [m.value for m in e]),
+        default=GroupMemberRole.MEMBER,
+    )
+    status = Column(
+        Enum(GroupMemberState, name="group_member_status", values_callable=lambda e: [m.value for m in e]),
+        default=GroupMemberState.ACTIVE,
+    )
+
+    # Covers the active-membership check run by most group routes, the
+    # per-group member lookups, and keeps a user to one membership per group
+    __table_args__ = (
+        Index("ix_group_members_user_id_group_id_status", "user_id", "group_id", "status"),
+        Index("ix_group_members_group_id_status", "group_id", "status"),
+        UniqueConstraint("user_id", "group_id", name="uq_group_members_user_id_group_id"),
+    )
 
     group = relationship("Group", back_populates="group_members")
     user = relationship("User", back_populates="group_members")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Enum, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -32,6 +32,17 @@ class Notification(Base):
     message = Column(String, nullable=False)
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.now(), index=True)
+
+    # Partial index over each user's unread notifications, newest first by ID
+    __table_args__ = (
+        Index(
+            "ix_notifications_user_id_unread",
+            "user_id",
+            "id",
+            postgresql_where=text("is_read IS false"),
+            sqlite_where=text("is_read IS 0"),
+        ),
+    )
     
     # Relationships
     owner = relationship("User", back_populates="notifications")
@@ -30,7 +30,7 @@ router = APIRouter()
 
 
 # Dependency to retrieve and verify the current admin user
-async def get_admin_user(
+def get_admin_user(
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="admin/login")),
     db: Session = Depends(get_db),
 ):
@@ -71,7 +71,7 @@ async def get_admin_user(
 
 
 @router.post("/login", response_model=LoginResponse)
-async def login(user: UserLogin, db: Session = Depends(get_db)):
+def login(user: UserLogin, db: Session = Depends(get_db)):
     db_admin = db.query(Admin).filter(Admin.email == user.email).first()
 
     if not db_admin or not verify_password(user.password, db_admin.hashed_password):
@@ -91,7 +91,7 @@ async def login(user: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/register", response_model=RegisterResponse)
-async def register(user: AdminCreate, db: Session = Depends(get_db)):
+def register(user: AdminCreate, db: Session = Depends(get_db)):
     if user.master_key != settings.MASTER_KEY:
         logger.warning(
             f"Invalid master key used during admin registration for username: '{user.username}' and email: {user.email}"
@@ -100,7 +100,7 @@ async def register(user: AdminCreate, db: Session = Depends(get_db)):
             status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect master key"
         )
 
-    if db.query(Admin).filter(Admin.username == user.username).first():
+    if db.query(db.query(Admin).filter(Admin.username == user.username).exists()).scalar():
         logger.warning(
             f"Attempt to register with an existing username: '{user.username}'"
         )
@@ -109,7 +109,7 @@ async def register(user: AdminCreate, db: Session = Depends(get_db)):
             detail="Username already registered",
         )
 
-    if db.query(Admin).filter(Admin.email == user.email).first():
+    if db.query(db.query(Admin).filter(Admin.email == user.email).exists()).scalar():
         logger.warning(f"Attempt to register with an existing email: {user.email}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
@@ -121,7 +121,6 @@ async def register(user: AdminCreate, db: Session = Depends(get_db)):
     )
     db.add(new_admin)
     db.commit()
-    db.refresh(new_admin)
     logger.info(
         f"New admin registered successfully: '{new_admin.username}' ({new_admin.email})."
     )
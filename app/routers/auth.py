@@ -18,6 +18,7 @@ from app.schemas import (
 from app.models import (
     User, 
     GroupMember, 
+    GroupMemberRole,
     Group,
     GroupDebt,
     GroupExpense
@@ -31,6 +32,9 @@ from app.utils import (
     create_refresh_token,
     verify_refresh_token,
     create_new_category,
+    invalidate_debt_category_cache,
+    invalidate_membership_cache,
+    invalidate_profile_cache,
     log_exception
 )
 from app.database import get_db
@@ -44,8 +48,10 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
 # Dependency to retrieve and verify the current user
-# This will be used to secure routes that require user authentication
-async def get_current_user(
+# This will be used to secure routes that require user authentication.
+# Declared as a plain function so FastAPI runs the blocking user lookup in
+# its threadpool instead of on the event loop.
+def get_current_user(
     token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
 ):
     """
@@ -82,19 +88,28 @@ async def get_current_user(
         # Query the user by username from the database
         db_user = db.query(User).filter(User.username == username).first()
         if db_user is None:
-            logger.warning(f"Unauthorized access attempt by unknown user '{username}'.")
+            logger.warning(
+                "Unauthorized access attempt by unknown user '%s'.",
+                username,
+            )
             raise credentials_exception
 
-        logger.info(f"User '{username}' authenticated successfully.")
+        logger.info(
+            "User '%s' authenticated successfully.",
+            username,
+        )
         return db_user
     except Exception as e:
-        logger.error(f"Error during admin authentication: {e}")
+        logger.error(
+            "Error during user authentication: %s",
+            e,
+        )
         raise
 
 
 # Register route to create a new user account
 @router.post("/register", response_model=RegisterResponse)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+def register(user: UserCreate, db: Session = Depends(get_db)):
     """
     Registers a new user account.
 
@@ -108,8 +123,7 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
     Returns:
         User: The newly created user object.
     """
-    db_user = db.query(User).filter(User.username == user.username).first()
-    if db_user:
+    if db.query(db.query(User).filter(User.username == user.username).exists()).scalar():
         log_exception(
             log_level="warning",
             log_message=f"Attempt to register with an existing username: {user.username}",
@@ -117,8 +131,7 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
             exception_message="Username already registered"
         )
 
-    db_email = db.query(User).filter(User.email == user.email).first()
-    if db_email:
+    if db.query(db.query(User).filter(User.email == user.email).exists()).scalar():
         log_exception(
             log_level="warning",
             log_message=f"Attempt to register with an existing email: {user.email}",
@@ -135,16 +148,9 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
     # Add the new user to the database
     db.add(new_user)
     db.commit()
-    db.refresh(new_user)
 
-    db_user = (
-        db.query(User)
-        .filter(
-            User.username == user.username, 
-            User.hashed_password == hashed_password
-        )
-        .first()
-    )
+    # The committed row keeps its attributes, so it needs no reload
+    db_user = new_user
     debt_category = CategoryCreate(
         name="Group Debts", 
         description="For all debts in groups"
@@ -177,7 +183,7 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
 
 # Login route for user authentication and token generation
 @router.post("/user/login", response_model=LoginResponse)
-async def user_login(user: UserLogin, db: Session = Depends(get_db)):
+def user_login(user: UserLogin, db: Session = Depends(get_db)):
     """
     Logs in a user by verifying the username and password, and returning a JWT access token.
 
@@ -242,7 +248,7 @@ async def protected_route(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/user/refresh-token", response_model=RefreshResponse)
-async def get_refresh_token(token: RefreshToken, db: Session = Depends(get_db)):
+def get_refresh_token(token: RefreshToken, db: Session = Depends(get_db)):
     """
     Generate a new access token using a valid refresh token.
 
@@ -294,35 +300,33 @@ def delete_account(
     Returns:
         dict: Success message confirming the user deletion.
     """
-    group_members = (
-        db.query(GroupMember)
-        .filter(GroupMember.user_id == user.id, GroupMember.role == "manager")
+    memberships = (
+        db.query(GroupMember.group_id, GroupMember.role)
+        .filter(GroupMember.user_id == user.id)
         .all()
     )
-    if group_members:
-        for group_member in group_members:
-            groups = db.query(Group).filter(Group.id == group_member.group_id).all()
-            for group in groups:
-                db.delete(group)
-                db.commit()
-    creditor_group_debts = (
-            db.query(GroupDebt)
-            .filter(GroupDebt.creditor_id == user.id)
-            .all()
-        )
-    if creditor_group_debts:
-        for group_debt in creditor_group_debts:
-            db.delete(group_debt)
-            db.commit()
-    debtor_group_debts = (
-            db.query(GroupDebt)
-            .filter(GroupDebt.debtor_id == user.id)
+    managed_group_ids = [
+        group_id for group_id, role in memberships if role == GroupMemberRole.MANAGER
+    ]
+    # Every member of a group that is deleted loses it, elsewhere only this user leaves
+    affected_member_ids = {group_id: [user.id] for group_id, _ in memberships}
+    if managed_group_ids:
+        for group_id, member_id in (
+            db.query(GroupMember.group_id, GroupMember.user_id)
+            .filter(GroupMember.group_id.in_(managed_group_ids))
             .all()
-        )
-    if debtor_group_debts:
-        for group_debt in debtor_group_debts:
-            db.delete(group_debt)
-            db.commit()
+        ):
+            if member_id != user.id:
+                affected_member_ids[group_id].append(member_id)
+        for group in db.query(Group).filter(Group.id.in_(managed_group_ids)).all():
+            db.delete(group)
+    group_debts = (
+        db.query(GroupDebt)
+        .filter((GroupDebt.creditor_id == user.id) | (GroupDebt.debtor_id == user.id))
+        .all()
+    )
+    for group_debt in group_debts:
+        db.delete(group_debt)
     user_id = (
         db.query(User.id)
         .filter(User.username == user.username, User.email == user.email)
@@ -340,13 +344,17 @@ def delete_account(
 
     db.delete(target_user)
     db.commit()
+    invalidate_debt_category_cache(user_id)
+    invalidate_profile_cache(user_id)
+    for group_id, member_ids in affected_member_ids.items():
+        invalidate_membership_cache(group_id, *member_ids)
     logger.info(f"User '{user.username}' deleted account (ID: {user_id}).")
     return {"detail": f"Deleted account of '{target_user.username}' successfully"}
 
 
 # Login route for user authentication and token generation
 @router.post("/login")
-async def login_for_oauth_form(
+def login_for_oauth_form(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
 ):
     db_user = db.query(User).filter(User.email == form_data.username).first()
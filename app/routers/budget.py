@@ -17,7 +17,7 @@ from app.database import get_db
 from app.routers.auth import get_current_user
 from app.models import User
 from app.background_tasks import check_budget, check_and_deactivate_expired_budgets
-from app.utils import logger
+from app.utils import logger, invalidate_unread_notifications_cache
 
 # Create an instance of APIRouter to handle budget-related routes
 router = APIRouter()
@@ -48,7 +48,7 @@ def set_general_budget(
         GeneralBudgetResponse: The newly created budget.
     """
     # Check if the user already has a set budget
-    existing_budget = (
+    existing_budget = db.query(
         db.query(GeneralBudget)
         .filter(
             GeneralBudget.user_id == user.id,
@@ -56,8 +56,8 @@ def set_general_budget(
             GeneralBudget.start_date <= budget_data.end_date,
             GeneralBudget.end_date >= budget_data.start_date,
         )
-        .first()
-    )
+        .exists()
+    ).scalar()
     if existing_budget:
         logger.warning(
             f"User '{user.username}' (ID: {user.id}) attempted to create a budget, but an active budget already exists."
@@ -85,7 +85,6 @@ def set_general_budget(
     new_budget = GeneralBudget(**budget_data.model_dump(), user_id=user.id)
     db.add(new_budget)
     db.commit()
-    db.refresh(new_budget)
     background_tasks.add_task(check_budget, user.id)
     background_tasks.add_task(check_and_deactivate_expired_budgets)
     logger.info(
@@ -182,6 +181,7 @@ def update_general_budget(
         Notification.is_read == False,
     ).update({"is_read": True})
     db.commit()
+    invalidate_unread_notifications_cache(user.id)
     logger.info(
         f"Notifications reset for user '{user.username}' (ID: {user.id}) due to budget update."
     )
@@ -191,7 +191,6 @@ def update_general_budget(
         setattr(budget, key, value)
 
     db.commit()
-    db.refresh(budget)
     background_tasks.add_task(check_budget, user.id)
     background_tasks.add_task(check_and_deactivate_expired_budgets)
     logger.info(
@@ -310,6 +309,7 @@ def deactivate_general_budget(
         Notification.is_read == False,
     ).update({"is_read": True})
     db.commit()
+    invalidate_unread_notifications_cache(user.id)
     logger.info(
         f"Notifications reset for user '{user.username}' (ID: {user.id}) due to budget deactivation."
     )
@@ -317,7 +317,6 @@ def deactivate_general_budget(
     # Deactivate the budget and commit the changes
     setattr(budget, "status", "deactivated")
     db.commit()
-    db.refresh(budget)
     logger.info(
         f"Deactivated budget of amount {budget.amount_limit} for {budget.start_date} to {budget.end_date} successfully for user '{user.username}' (ID: {user.id})."
     )
@@ -374,6 +373,7 @@ def delete_general_budget(
         Notification.is_read == False,
     ).update({"is_read": True})
     db.commit()
+    invalidate_unread_notifications_cache(user.id)
     logger.info(
         f"Notifications reset for user '{user.username}' (ID: {user.id}) due to budget deletion."
     )
@@ -15,7 +15,9 @@ from app.utils import (
     existing_category_attribute,
     get_category_model_by_name,
     get_category_model_by_id,
-    create_new_category
+    create_new_category,
+    invalidate_debt_category_cache,
+    DEBT_CATEGORY_NAME
 )
 
 # Create an instance of APIRouter for category-related routes
@@ -33,8 +35,6 @@ def create_category(
     Creates a new category for the authenticated user and automatically creates a default category budget.
     """
 
-    db_user = db.query(User).filter(User.email == user.email).first()
-
     # Check for existing category name and description   
     existing_category_attribute(db=db, user=user, category=category, attribute="name")
     existing_category_attribute(db=db, user=user, category=category, attribute="description")
@@ -42,7 +42,7 @@ def create_category(
     new_category = create_new_category(
         db=db,
         category=category,
-        db_user=db_user
+        db_user=user
     )
 
     background_tasks.add_task(check_category_budget, user.id)
@@ -141,12 +141,17 @@ def update_category_by_id(
     """
     category = get_category_model_by_id(db=db, user=user, category_id=category_id)
 
+    previous_name = category.name
+
     # Update category attributes with new values
     for key, value in category_data.model_dump(exclude_unset=True).items():
         setattr(category, key, value)
 
     db.commit()  # Commit changes to the database
-    db.refresh(category)  # Refresh to get the updated state
+
+    # Renaming to or from the debt category changes which row debt payments use
+    if DEBT_CATEGORY_NAME in (previous_name, category.name):
+        invalidate_debt_category_cache(user.id)
 
     logger.info(
         f"Category {category_id} updated for user '{user.username}' (ID: {user.id})."
@@ -179,12 +184,17 @@ def update_category_by_name(
     """
     category = get_category_model_by_name(db=db, user=user, category_name=category_name)
 
+    previous_name = category.name
+
     # Update category attributes with new values
     for key, value in category_data.model_dump(exclude_unset=True).items():
         setattr(category, key, value)
 
     db.commit()  # Commit changes to the database
-    db.refresh(category)  # Refresh to get the updated state
+
+    # Renaming to or from the debt category changes which row debt payments use
+    if DEBT_CATEGORY_NAME in (previous_name, category.name):
+        invalidate_debt_category_cache(user.id)
 
     logger.info(
         f"Category {category_name} updated for user '{user.username}' (ID: {user.id})."
@@ -215,7 +225,7 @@ def delete_category_by_id(
     """
     category = get_category_model_by_id(db=db, user=user, category_id=category_id)
 
-    if category.name == "Group Debts":
+    if category.name == DEBT_CATEGORY_NAME:
         logger.error(
             f"Attempt to delete restricted category 'Group Debts' by user '{user.username}' (ID: {user.id})."
         )
@@ -256,7 +266,7 @@ def delete_category_by_name(
     """
     category = get_category_model_by_name(db=db, user=user, category_name=category_name)
 
-    if category.name == "Group Debts":
+    if category.name == DEBT_CATEGORY_NAME:
         logger.error(
             f"Attempt to delete restricted category 'Group Debts' by user '{user.username}' (ID: {user.id})."
         )
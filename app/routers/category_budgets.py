@@ -24,7 +24,7 @@ from app.routers.auth import get_current_user
 from app.models import User
 from app.background_tasks import check_category_budget
 from app.websocket_manager import manager
-from app.utils import logger
+from app.utils import logger, invalidate_unread_notifications_cache
 
 router = APIRouter()
 
@@ -178,11 +178,11 @@ def modify_category_budget(
         Notification.is_read == False,
     ).update({"is_read": True})
     db.commit()
+    invalidate_unread_notifications_cache(user.id)
     for key, value in budget_data.model_dump(exclude_unset=True).items():
         setattr(budget, key, value)
 
     db.commit()
-    db.refresh(budget)
     background_tasks.add_task(check_category_budget, user.id)
     logger.info(
         f"Category budget updated for user '{user.username}' (ID: {user.id})."
@@ -241,6 +241,7 @@ def deactivate_category_budget(
         Notification.is_read == False,
     ).update({"is_read": True})
     db.commit()
+    invalidate_unread_notifications_cache(user.id)
     budget.status = "deactivated"
     db.commit()
     logger.info(
@@ -1,7 +1,7 @@
 # app/routers/expenses.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query, Request, Response
+from sqlalchemy import desc, delete, update, select, func
 from sqlalchemy.orm import Session
 from datetime import date
 from app.schemas import (
@@ -16,8 +16,8 @@ from app.models import Expense, Category
 from app.routers.auth import get_current_user
 from app.database import get_db
 from app.models import User
-from app.background_tasks import check_budget, check_category_budget
-from app.utils import logger, get_expense_model
+from app.background_tasks import queue_budget_checks
+from app.utils import logger, get_expense_model, get_expense_etag, etag_matches, log_exception
 from math import ceil
 
 # Create an instance of APIRouter for expense-related routes
@@ -46,7 +46,9 @@ def create_expense(
         HTTPException: If there is an issue with creating the expense.
     """
     logger.info(
-        f"Creating expense for user '{current_user.username}' (ID: {current_user.id}) "
+        "Creating expense for user '%s' (ID: %s)",
+        current_user.username,
+        current_user.id,
     )
     # Check if the category_id exists in the category table
     category = (
@@ -59,7 +61,10 @@ def create_expense(
     )
     if not category:
         logger.warning(
-            f"Failed to create expense: Category '{expense.category_name}' not found for user '{current_user.username}' (ID: {current_user.id}) "
+            "Failed to create expense: Category '%s' not found for user '%s' (ID: %s)",
+            expense.category_name,
+            current_user.username,
+            current_user.id,
         )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -75,12 +80,13 @@ def create_expense(
     )
     db.add(new_expense)  # Add the new expense to the session
     db.commit()  # Commit the transaction to the database
-    db.refresh(new_expense)  # Refresh to get the latest state of the expense
     logger.info(
-        f"Created expense ID: {new_expense.id} successfully for user '{current_user.username}' (ID: {current_user.id}) "
+        "Created expense ID: %s successfully for user '%s' (ID: %s)",
+        new_expense.id,
+        current_user.username,
+        current_user.id,
     )
-    background_tasks.add_task(check_budget, current_user.id)
-    background_tasks.add_task(check_category_budget, current_user.id)
+    queue_budget_checks(background_tasks, current_user.id)
     return new_expense
 
 
@@ -117,12 +123,14 @@ def get_expenses(
         dict: Dictionary containing the list of expenses and pagination metadata.
     """
     logger.info(
-        f"Fetching expenses for user '{current_user.username}' (ID: {current_user.id}) with query parameters."
+        "Fetching expenses for user '%s' (ID: %s) with query parameters.",
+        current_user.username,
+        current_user.id,
     )
 
     # Base query with joins and user-specific filtering
     query = (
-        db.query(
+        select(
             Expense.id,
             Expense.amount,
             Expense.name,
@@ -131,41 +139,34 @@ def get_expenses(
             Category.name.label("category_name"),
         )
         .join(Category, Expense.category_id == Category.id)
-        .filter(Expense.user_id == current_user.id)
+        .where(Expense.user_id == current_user.id)
     )
 
     # Apply filters if provided
     if start_date:
-        query = query.filter(Expense.date >= start_date)
+        query = query.where(Expense.date >= start_date)
     if end_date:
-        query = query.filter(Expense.date <= end_date)
+        query = query.where(Expense.date <= end_date)
     if name:
-        query = query.filter(Expense.name.ilike(f"%{name}%"))
+        query = query.where(Expense.name.ilike(f"%{name}%"))
     if category_name:
-        query = query.filter(Category.name.ilike(f"%{category_name}%"))
+        query = query.where(Category.name.ilike(f"%{category_name}%"))
     if keyword:
-        query = query.filter(
+        query = query.where(
             Expense.name.ilike(f"%{keyword}%") | Category.name.ilike(f"%{keyword}%")
         )
 
     # Get the total count before applying pagination
-    total_count = query.count()
+    total_count = db.execute(
+        select(func.count()).select_from(query.subquery())
+    ).scalar_one()
 
     # Apply ordering, pagination, and execute query
-    expenses = (
+    expenses = db.execute(
         query.order_by(desc(Expense.date), desc(Expense.id))
         .offset(offset)
         .limit(limit)
-        .all()
-    )
-
-    if not expenses:
-        logger.warning(
-            f"No expenses found for user '{current_user.username}' (ID: {current_user.id}) with applied filters or search."
-        )
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="No expenses found."
-        )
+    ).all()
 
     # Calculate pagination metadata
     total_pages = ceil(total_count / limit)
@@ -180,17 +181,8 @@ def get_expenses(
         "per_page": limit,
         "next_page": next_page,
         "prev_page": prev_page,
-        "expenses": [
-            {
-                "id": expense.id,
-                "amount": expense.amount,
-                "name": expense.name,
-                "date": expense.date,
-                "category_id": expense.category_id,
-                "category_name": expense.category_name,
-            }
-            for expense in expenses
-        ],
+        # Rows already carry exactly the response columns, so map them directly
+        "expenses": [expense._asdict() for expense in expenses],
     }
     return result
 
@@ -200,6 +192,8 @@ def get_expenses(
 @router.get("/id/{expense_id}", response_model=ExpenseResponse)
 def get_expense(
     expense_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -208,21 +202,37 @@ def get_expense(
 
     Args: \n
         expense_id (int): The ID of the expense to retrieve.
+        request (Request): The incoming request, checked for If-None-Match.
+        response (Response): The outgoing response, used to set the ETag.
         db (Session): The database session to interact with the database.
         current_user (User): The currently authenticated user.
 
     Returns:
-        ExpenseResponse: The expense with the specified ID.
+        ExpenseResponse: The expense with the specified ID, or an empty 304
+        response if the client's cached copy is still current.
 
     Raises:
         HTTPException: If the expense is not found or does not belong to the user.
     """
     logger.info(
-        f"Retrieving expense ID: {expense_id} for user '{current_user.username}' (ID: {current_user.id}) "
+        "Retrieving expense ID: %s for user '%s' (ID: %s)",
+        expense_id,
+        current_user.username,
+        current_user.id,
     )
     expense = get_expense_model(db=db, expense_id=expense_id, current_user=current_user, action="retrieve")
+
+    # Skip serializing the body when the client already has this version
+    etag = get_expense_etag(expense)
+    if etag_matches(etag, request.headers.get("if-none-match")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
     logger.info(
-        f"Retrieved expense ID: {expense.id} successfully for user '{current_user.username}' (ID: {current_user.id}) "
+        "Retrieved expense ID: %s successfully for user '%s' (ID: %s)",
+        expense.id,
+        current_user.username,
+        current_user.id,
     )
     return expense
 
@@ -251,18 +261,36 @@ def update_expense(
         HTTPException: If the expense is not found or does not belong to the user.
     """
     logger.info(
-        f"Updating expense ID: {expense_id} for user '{current_user.username}' (ID: {current_user.id}) "
+        "Updating expense ID: %s for user '%s' (ID: %s)",
+        expense_id,
+        current_user.username,
+        current_user.id,
     )
-    expense = get_expense_model(db=db, expense_id=expense_id, current_user=current_user, action="update")
-
-    # Update expense attributes with new values
-    for key, value in expense_update.model_dump(exclude_unset=True).items():
-        setattr(expense, key, value)
+    updates = expense_update.model_dump(exclude_unset=True)
+    if not updates:
+        expense = get_expense_model(db=db, expense_id=expense_id, current_user=current_user, action="update")
+    else:
+        # Apply the new values in a single UPDATE ... RETURNING, without a prior SELECT
+        expense = db.execute(
+            update(Expense)
+            .where(Expense.id == expense_id, Expense.user_id == current_user.id)
+            .values(**updates)
+            .returning(Expense)
+        ).scalar_one_or_none()
+        if not expense:
+            log_exception(
+                log_level="warning",
+                log_message=f"Failed to update expense ID: {expense_id} for user '{current_user.username}' (ID: {current_user.id})",
+                status_raised=status.HTTP_404_NOT_FOUND,
+                exception_message=f"Expense ID: {expense_id} not found"
+            )
 
     db.commit()  # Commit changes to the database
-    db.refresh(expense)  # Refresh to get the updated state
     logger.info(
-        f"Updated expense ID: {expense.id} successfully for user '{current_user.username}' (ID: {current_user.id}) "
+        "Updated expense ID: %s successfully for user '%s' (ID: %s)",
+        expense.id,
+        current_user.username,
+        current_user.id,
     )
     return expense
 
@@ -289,14 +317,30 @@ def delete_expense(
         HTTPException: If the expense is not found or does not belong to the user.
     """
     logger.info(
-        f"Deleting expense ID: {expense_id} for user '{current_user.username}' (ID: {current_user.id}) "
+        "Deleting expense ID: %s for user '%s' (ID: %s)",
+        expense_id,
+        current_user.username,
+        current_user.id,
     )
-    expense = get_expense_model(db=db, expense_id=expense_id, current_user=current_user, action="delete")
-
-    db.delete(expense)  # Delete the expense from the session
+    # Delete in a single statement, returning only what the response needs
+    expense = db.execute(
+        delete(Expense)
+        .where(Expense.id == expense_id, Expense.user_id == current_user.id)
+        .returning(Expense.id, Expense.name, Expense.amount)
+    ).first()
+    if not expense:
+        log_exception(
+            log_level="warning",
+            log_message=f"Failed to delete expense ID: {expense_id} for user '{current_user.username}' (ID: {current_user.id})",
+            status_raised=status.HTTP_404_NOT_FOUND,
+            exception_message=f"Expense ID: {expense_id} not found"
+        )
     db.commit()  # Commit the deletion to the database
     logger.info(
-        f"Deleted expense ID: {expense.id} successfully for user '{current_user.username}' (ID: {current_user.id}) "
+        "Deleted expense ID: %s successfully for user '%s' (ID: %s)",
+        expense.id,
+        current_user.username,
+        current_user.id,
     )
     return {
         "detail": f"Expense '{expense.name}' of amount {expense.amount} deleted successfully"
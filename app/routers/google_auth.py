@@ -9,10 +9,10 @@ from app.models import (
 )
 from app.schemas import GoogleLogin,LoginResponse
 from app.database import get_db
-from app.utils import logger, create_access_token, create_refresh_token
+from app.utils import logger, create_access_token, create_refresh_token, invalidate_profile_cache
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-import requests
+import httpx
 from datetime import date
 from calendar import monthrange
 
@@ -22,6 +22,10 @@ GOOGLE_CLIENT_ID = settings.GOOGLE_CLIENT_ID
 GOOGLE_CLIENT_SECRET = settings.GOOGLE_CLIENT_SECRET
 GOOGLE_REDIRECT_URI = settings.GOOGLE_REDIRECT_URI
 
+# Shared async HTTP client so calls to Google reuse pooled connections
+# without blocking the event loop (closed on application shutdown)
+http_client = httpx.AsyncClient(timeout=5.0)
+
 @router.get("/login/google", response_model=GoogleLogin)
 async def login_google():
     return {
@@ -40,7 +44,7 @@ async def auth_google(code: str, db: Session = Depends(get_db)):
         "redirect_uri": GOOGLE_REDIRECT_URI,
         "grant_type": "authorization_code",
     }
-    response = requests.post(token_url, data=data)
+    response = await http_client.post(token_url, data=data)
     access_token = response.json().get("access_token")
 
     if not access_token:
@@ -49,7 +53,7 @@ async def auth_google(code: str, db: Session = Depends(get_db)):
             detail="Failed to retrieve access token from Google",
         )
 
-    user_info = requests.get(
+    user_info = await http_client.get(
         "https://www.googleapis.com/oauth2/v1/userinfo",
         headers={"Authorization": f"Bearer {access_token}"},
     )
@@ -80,50 +84,31 @@ async def auth_google(code: str, db: Session = Depends(get_db)):
             google_id=google_id,  # Optional, if you want to store the Google ID
         )
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-        db_user = (
-            db.query(User)
-            .filter(User.username == new_user.username, User.hashed_password == None, User.email==email, User.google_id==google_id)
-            .first()
-        )
+        db.flush()  # Populate the user ID without committing
+        db_user = new_user
         new_category = Category(
             name="Group Debts", description="For all group debts", user_id=db_user.id
         )
 
         db.add(new_category)  # Add the new category to the session
-        db.commit()  # Commit the changes to the database
-        db.refresh(new_category)  # Refresh to get the latest state of the category
+        db.flush()  # Populate the category ID without committing
 
         # Generate default category budget for the current month
         today = date.today()
         start_date = today.replace(day=1)  # Start of current month
         end_date = today.replace(day=monthrange(today.year, today.month)[1])  # End of current month
 
-        # Check if a default budget exists for the category
-        existing_budget = db.query(CategoryBudget).filter(
-            CategoryBudget.category_id == new_category.id,
-            CategoryBudget.user_id == db_user.id,
-            CategoryBudget.status == "active",
-            CategoryBudget.start_date <= end_date,
-            CategoryBudget.end_date >= start_date,
-        ).first()
-
-        if existing_budget:
-            logger.warning(f"An active budget already exists for category '{new_category.name}' (ID: {new_category.id}).")
-        else:
-            # Create a new default budget
-            new_budget = CategoryBudget(
-                category_id=new_category.id,
-                amount_limit=0,
-                start_date=start_date,
-                end_date=end_date,
-                user_id=db_user.id
-            )
-            db.add(new_budget)
-            db.commit()
-            db.refresh(new_budget)
-            logger.info(f"Default budget created for category '{new_category.name}' with ID {new_budget.id}.")
+        # The category was just created, so it cannot have a budget yet
+        new_budget = CategoryBudget(
+            category_id=new_category.id,
+            amount_limit=0,
+            start_date=start_date,
+            end_date=end_date,
+            user_id=db_user.id
+        )
+        db.add(new_budget)
+        db.flush()
+        logger.info(f"Default budget created for category '{new_category.name}' with ID {new_budget.id}.")
 
         logger.info(
             f"New user registered successfully: {new_user.username} ({new_user.email})."
@@ -134,7 +119,8 @@ async def auth_google(code: str, db: Session = Depends(get_db)):
         db_user.google_id = google_id
     if not db_user.profile_picture:
         db_user.profile_picture = picture
-    db.commit()
+    db.commit()  # Single commit for the sign-up rows and backfilled fields
+    invalidate_profile_cache(db_user.id)  # The backfilled fields may be part of a cached profile
     # Generate tokens
     access_token = create_access_token(data={"sub": db_user.username})
     refresh_token = create_refresh_token(data={"sub": db_user.username})
@@ -1,9 +1,11 @@
 # app/routers/group_debt.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import update, select, insert
 from sqlalchemy.orm import Session
 from app.models import (
     GroupDebt,
+    Notification,
     NotificationType, 
     User,
     Expense,
@@ -12,9 +14,11 @@ from app.models import (
 from app.database import get_db
 from app.routers.auth import get_current_user
 from app.utils import (
-    check_group_membership,
-    send_notification,
-    get_debt_model
+    ensure_group_membership,
+    get_debt_model,
+    get_debt_category_id,
+    invalidate_unread_notifications_cache,
+    DEBT_CATEGORY_NAME
 )
 
 router = APIRouter()
@@ -30,8 +34,8 @@ def create_group_debt(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Check group membership
-    check_group_membership(group_id, current_user, db)
+    # Check group membership without loading the membership row
+    ensure_group_membership(group_id, current_user, db)
     
     # Create new debt record
     new_debt = GroupDebt(
@@ -39,19 +43,22 @@ def create_group_debt(
         debtor_id=debtor_id,
         creditor_id=creditor_id,
         amount=amount,
-        description=description
+        description=description,
+        due_date=None
     )
     db.add(new_debt)
-    db.commit()
-    db.refresh(new_debt)
-
-    # Create and send a debt notification)
-    send_notification(
-        db=db, 
-        user_id=creditor_id, 
-        type=NotificationType.GROUP_DEBT, 
-        message=f"You are owed {amount} by {debtor_id} for {description}"
+
+    # Create the debt notification in the same transaction
+    db.execute(
+        insert(Notification),
+        [{
+            "user_id": creditor_id,
+            "type": NotificationType.GROUP_DEBT,
+            "message": f"You are owed {amount} by {debtor_id} for {description}"
+        }],
     )
+    db.commit()
+    invalidate_unread_notifications_cache(creditor_id)
 
     return {"message": "Debt created successfully", "debt": new_debt}
 
@@ -62,18 +69,20 @@ def accept_debt(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    debt = get_debt_model(
-        db=db,
-        user=current_user,
-        debt_id=debt_id
-    )
-
-    if debt.debtor_id != current_user.id:
+    # Mark debt as active for payment in a single UPDATE ... RETURNING
+    debt = db.execute(
+        update(GroupDebt)
+        .where(GroupDebt.id == debt_id, GroupDebt.debtor_id == current_user.id)
+        .values(status="active")
+        .returning(GroupDebt)
+    ).scalar_one_or_none()
+
+    if not debt:
+        # Raises a 404 if the debt does not exist at all
+        get_debt_model(db=db, user=current_user, debt_id=debt_id)
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You cannot accept a debt that is not yours")
 
-    debt.status = "active"  # Mark debt as active for payment
     db.commit()
-    db.refresh(debt)
 
     return {"message": "Debt accepted", "debt": debt}
 
@@ -84,18 +93,19 @@ def dispute_debt(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    debt = get_debt_model(
-        db=db,
-        user=current_user,
-        debt_id=debt_id
-    )
-
-    if debt.debtor_id != current_user.id:
+    debt = db.execute(
+        update(GroupDebt)
+        .where(GroupDebt.id == debt_id, GroupDebt.debtor_id == current_user.id)
+        .values(status="disputed")
+        .returning(GroupDebt)
+    ).scalar_one_or_none()
+
+    if not debt:
+        # Raises a 404 if the debt does not exist at all
+        get_debt_model(db=db, user=current_user, debt_id=debt_id)
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You cannot dispute a debt that is not yours")
 
-    debt.status = "disputed"
     db.commit()
-    db.refresh(debt)
 
     return {"message": "Debt disputed", "debt": debt}
 
@@ -143,39 +153,40 @@ def pay_debt(
         debt.status = "partial"
 
     # Associate debt payment with the 'Debt' category as an expense
-    debt_category = db.query(Category).filter(
-        Category.name == "Group Debts", 
-        Category.user_id == current_user.id
-    ).first()
+    debt_category_id = get_debt_category_id(db=db, user_id=current_user.id)
 
-    if not debt_category:
+    if debt_category_id is None:
         # Create the Debt category for the user if it doesn't exist
         debt_category = Category(
-            name="Group Debts",
+            name=DEBT_CATEGORY_NAME,
+            description="For all debts in groups",
             user_id=current_user.id
         )
         db.add(debt_category)
-        db.commit()
-        db.refresh(debt_category)
+        db.flush()  # Populate the category ID without committing
+        debt_category_id = debt_category.id
 
     # Add a new expense for this debt payment
     new_expense = Expense(
         amount=amount_paid,
         name=f"Payment for Debt #{debt.description}",
         user_id=current_user.id,
-        category_id=debt_category.id,
+        category_id=debt_category_id,
     )
+
     db.add(new_expense)
 
-    # Notify the creditor about the payment
-    send_notification(
-        db=db, 
-        user_id=debt.creditor_id, 
-        type=NotificationType.GROUP_DEBT, 
-        message=f"{current_user.username} has paid {amount_paid} towards your debt"
+    # Notify the creditor about the payment without going through the unit of work
+    db.execute(
+        insert(Notification),
+        [{
+            "user_id": debt.creditor_id,
+            "type": NotificationType.GROUP_DEBT,
+            "message": f"{current_user.username} has paid {amount_paid} towards your debt"
+        }],
     )
-    db.refresh(debt)
-    db.refresh(new_expense)
+    db.commit()
+    invalidate_unread_notifications_cache(debt.creditor_id)
 
     return {
         "message": f"Debt payment ({payment_type}) successful", 
@@ -204,7 +215,6 @@ def confirm_payment(
 
     debt.status = "paid"
     db.commit()
-    db.refresh(debt)
 
     return {"message": "Payment confirmed", "debt": debt}
 
@@ -214,10 +224,9 @@ def get_debts_owed(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    debts = db.query(GroupDebt).filter(GroupDebt.debtor_id == current_user.id).all()
-    if not debts:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No debts found")
-
+    debts = db.execute(
+        select(GroupDebt).where(GroupDebt.debtor_id == current_user.id)
+    ).scalars().all()
     return {
         "total_owed":sum(debt.amount for debt in debts),
         "debts": debts
@@ -229,10 +238,9 @@ def get_debts_owed_to(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    debts = db.query(GroupDebt).filter(GroupDebt.creditor_id == current_user.id).all()
-    if not debts:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No debts found")
-
+    debts = db.execute(
+        select(GroupDebt).where(GroupDebt.creditor_id == current_user.id)
+    ).scalars().all()
     return {
         "total_owed_to": sum(debt.amount for debt in debts),
         "debts": debts
@@ -1,108 +1,152 @@
 # app/routers/group_expenses.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
+from sqlalchemy import insert, func
+from sqlalchemy.orm import Session, selectinload
 from app.schemas import (
     GroupExpenses,
     GroupExpenseCreate,
     ExpenseSplitCreate,
-    GroupMemberExpenseShare
+    GroupMemberExpenseShare,
+    DebtsSummary
 )
 from app.models import (
     User,
     Expense,
     GroupExpense,
     GroupMember,
+    GroupMemberState,
     ExpenseSplit,
     Category,
-    NotificationType,
     GroupDebt
 )
 from app.database import get_db
 from app.routers.auth import get_current_user
-from app.utils import (
-    logger,
-    send_notification
-)
+from app.background_tasks import notify_debtors
+from app.utils import logger, is_active_member
 from datetime import date, datetime
+from decimal import Decimal
 
 router = APIRouter()
 
-@router.get("/{group_id}/expenses", response_model=list[GroupExpenses])
+
+# Dependency guarding the group routes below: the caller must be an active member
+def require_active_member(
+    group_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not is_active_member(db=db, user_id=current_user.id, group_id=group_id):
+        logger.warning(
+            "User '%s' (ID: %s) is not an active member of group ID: %s",
+            current_user.username,
+            current_user.id,
+            group_id,
+        )
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You must be an active member of the group")
+
+@router.get("/{group_id}/expenses", response_model=list[GroupExpenses], dependencies=[Depends(require_active_member)])
 def get_group_expenses(
     group_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    limit: int = Query(
+        50, ge=1, le=500, description="Maximum number of group expenses to return."
+    ),
+    offset: int = Query(0, ge=0, description="Number of group expenses to skip."),
+    cursor_id: int | None = Query(
+        None, description="Only return group expenses with an ID below this one (keyset pagination)."
+    ),
 ):
-    # Ensure the user is a member of the group
-    member_check = db.query(GroupMember).filter(
-        GroupMember.user_id == current_user.id, GroupMember.group_id == group_id, GroupMember.status == "active"
-    ).first()
-    if not member_check:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You must be an active member of the group to view expenses")
-
-    expenses = db.query(GroupExpense).filter(GroupExpense.group_id == group_id).all()
-    return [
-        GroupExpenses(id=expense.id, payer_id=expense.payer_id, amount=expense.amount, description=expense.description, created_at=expense.created_at)
-        for expense in expenses
-    ]
+    # Select only the columns the response needs instead of full ORM rows, newest first
+    query = (
+        db.query(GroupExpense)
+        .with_entities(
+            GroupExpense.id,
+            GroupExpense.payer_id,
+            GroupExpense.amount,
+            GroupExpense.description,
+            GroupExpense.created_at,
+        )
+        .filter(GroupExpense.group_id == group_id)
+    )
+    if cursor_id is not None:
+        query = query.filter(GroupExpense.id < cursor_id)
+    expenses = query.order_by(GroupExpense.id.desc()).offset(offset).limit(limit).all()
+    # The from_attributes response model reads the rows directly, so no
+    # per-row model instances are built here before serialization
+    return expenses
 
-@router.get("/{group_id}/expenses/{expense_id}/share", response_model=GroupMemberExpenseShare)
+@router.get("/{group_id}/expenses/{expense_id}/share", response_model=GroupMemberExpenseShare, dependencies=[Depends(require_active_member)])
 def get_member_expense_share(
     group_id: int,
     expense_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Ensure the user is a member of the group
-    member_check = db.query(GroupMember).filter(
-        GroupMember.user_id == current_user.id, GroupMember.group_id == group_id, GroupMember.status == "active"
-    ).first()
-    if not member_check:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You must be an active member of the group to view expenses")
-
-    # Find the expense and its splits
-    expense = db.query(GroupExpense).filter(GroupExpense.id == expense_id).first()
+    # Find the expense within this group and eager-load its splits in one batched follow-up query
+    expense = (
+        db.query(GroupExpense)
+        .options(selectinload(GroupExpense.expense_splits))
+        .filter(GroupExpense.id == expense_id, GroupExpense.group_id == group_id)
+        .first()
+    )
     if not expense:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Expense not found")
 
-    splits = db.query(ExpenseSplit).filter(ExpenseSplit.expense_id == expense.id).all()
-    total_amount = sum(split.amount for split in splits)
-    user_share = next((split.amount for split in splits if split.user_id == current_user.id), 0)
+    # Total the splits and pick out the user's share in a single pass
+    total_amount = 0
+    user_share = 0
+    for split in expense.expense_splits:
+        total_amount += split.amount
+        if split.user_id == current_user.id:
+            user_share = split.amount
 
     return GroupMemberExpenseShare(amount=user_share, total_amount=total_amount, description=expense.description)
 
 
-@router.post("/{group_id}/expenses", response_model=GroupExpenses)
+@router.post("/{group_id}/expenses", response_model=GroupExpenses, dependencies=[Depends(require_active_member)])
 def create_and_split_group_expense(
+    background_tasks: BackgroundTasks,
     group_id: int,
     expense: GroupExpenseCreate,
     splits: list[ExpenseSplitCreate],
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Ensure user is a member of the group
-    member = db.query(GroupMember).filter_by(user_id=current_user.id, group_id=group_id, status="active").first()
-    if not member:
-        logger.warning(f"User '{current_user.username}' (ID: {current_user.id}) is not an active member of group ID: {group_id}")
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You must be an active group member to add expenses")
+    # Ensure every split user is an active group member with a single IN query
+    split_user_ids = {split.user_id for split in splits}
+    active_member_ids = {
+        user_id for (user_id,) in db.query(GroupMember.user_id).filter(
+            GroupMember.group_id == group_id,
+            GroupMember.status == GroupMemberState.ACTIVE,
+            GroupMember.user_id.in_(split_user_ids)
+        ).all()
+    }
+
+    # Validate members and total the splits in one pass. Amounts are summed as
+    # Decimals so float drift (e.g. 0.1 + 0.2) does not reject a valid split.
+    total_split_amount = Decimal(0)
+    for split in splits:
+        if split.user_id not in active_member_ids:
+            logger.warning(
+                "User '%s' is not a member of group ID: %s",
+                split.user_id,
+                group_id,
+            )
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"User {split.user_id} is not a member of the group")
+        total_split_amount += Decimal(str(split.amount))
 
     # Validate split total matches the expense amount
-    total_split_amount = sum(split.amount for split in splits)
-    if total_split_amount != expense.amount:
-        logger.warning(f"Split total of {total_split_amount} does not match the expense amount {expense.amount}")
+    if total_split_amount != Decimal(str(expense.amount)):
+        logger.warning(
+            "Split total of %s does not match the expense amount %s",
+            total_split_amount,
+            expense.amount,
+        )
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The total split amount must equal the expense amount")
-    
-    # Create the expense entry
-    new_expense = GroupExpense(
-        group_id=group_id,
-        payer_id=current_user.id,
-        amount=expense.amount,
-        description=expense.description,
-    )
-    db.add(new_expense)
-    db.commit()
-    
+
+    # Resolve the category before writing anything, so every 4xx leaves the session untouched
     category = (
         db.query(Category)
         .filter(
@@ -113,13 +157,25 @@ def create_and_split_group_expense(
     )
     if not category:
         logger.warning(
-            f"Failed to create expense: Category 'Group Expenses' not found for user '{current_user.username}' (ID: {current_user.id}) "
+            "Failed to create expense: Category 'Group Expenses' not found for user '%s' (ID: %s) ",
+            current_user.username,
+            current_user.id,
         )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Please create the provided category first",
         )
-    
+
+    # Create the expense entry
+    new_expense = GroupExpense(
+        group_id=group_id,
+        payer_id=current_user.id,
+        amount=expense.amount,
+        description=expense.description,
+    )
+    db.add(new_expense)
+    db.flush()  # Populate the expense ID without committing
+
     # Proceed with creating the expense if category_id is valid
     expense_create = Expense(
         amount=expense.amount,
@@ -129,85 +185,81 @@ def create_and_split_group_expense(
         category_id=category.id,
     )
     db.add(expense_create)  # Add the new expense to the session
-    db.commit()  # Commit the transaction to the database
 
-    # Process each split and track debts
-    expense_splits = []
-    for split in splits:
-        # Ensure the user is a valid group member
-        group_member_check = db.query(GroupMember).filter(
-            GroupMember.user_id == split.user_id,
-            GroupMember.group_id == group_id,
-            GroupMember.status == "active"
-        ).first()
-        if not group_member_check:
-            logger.warning(f"User '{split.user_id}' is not a member of group ID: {group_id}")
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"User {split.user_id} is not a member of the group")
+    # Build the split and debt rows as plain dicts (hoisting the values every row shares), then insert each table in one batch
+    expense_id = new_expense.id
+    payer_id = current_user.id
+    debt_description = new_expense.description
+    split_rows = [
+        {"expense_id": expense_id, "user_id": split.user_id, "amount": split.amount}
+        for split in splits
+    ]
 
-        # Add split to the database
-        expense_split = ExpenseSplit(expense_id=new_expense.id, user_id=split.user_id, amount=split.amount)
-        db.add(expense_split)
-        expense_splits.append(expense_split)
-
-        # Create GroupDebt for other members who owe money
-        if split.user_id != current_user.id:
-            group_debt = GroupDebt(
-                group_id=group_id,
-                debtor_id=split.user_id,
-                creditor_id=current_user.id,
-                amount=split.amount,
-                description=f"{new_expense.description}",
-            )
-            db.add(group_debt)
-
-            # Create notification for the debtor
-            send_notification(
-                db=db,
-                user_id=split.user_id,
-                type=NotificationType.GROUP_DEBT,
-                message=f"You owe {current_user.username} {split.amount} for '{new_expense.description}'"
-            )
+    # Every member other than the payer owes their share to the payer
+    debtors = [split for split in splits if split.user_id != payer_id]
+    debt_rows = [
+        {
+            "group_id": group_id,
+            "debtor_id": split.user_id,
+            "creditor_id": payer_id,
+            "amount": split.amount,
+            "description": debt_description,
+        }
+        for split in debtors
+    ]
 
+    if split_rows:
+        db.execute(insert(ExpenseSplit), split_rows)
+    if debt_rows:
+        db.execute(insert(GroupDebt), debt_rows)
     db.commit()
 
-    logger.info(f"Created and split group expense ID: {new_expense.id} successfully for user '{current_user.username}' (ID: {current_user.id}) in group ID: {group_id}")
+    # Notify the debtors after the response is sent
+    if debt_rows:
+        background_tasks.add_task(
+            notify_debtors,
+            current_user.username,
+            new_expense.description,
+            [(split.user_id, split.amount) for split in debtors],
+        )
+
+    logger.info(
+        "Created and split group expense ID: %s successfully for user '%s' (ID: %s) in group ID: %s",
+        new_expense.id,
+        current_user.username,
+        current_user.id,
+        group_id,
+    )
     
-    return {
-        "id": new_expense.id,
-        "group_id": new_expense.group_id,
-        "payer_id": new_expense.payer_id,
-        "amount": new_expense.amount,
-        "description": new_expense.description,
-        "splits": [
-            {"id": split.id, "expense_id": new_expense.id, "user_id": split.user_id, "amount": split.amount}
-            for split in expense_splits
-        ],
-        "created_at": new_expense.created_at
-    }
+    # GroupExpenses carries no splits, so return the expense row as-is
+    return new_expense
 
 # New route to view the debts (People I'm Owing)
-@router.get("/{group_id}/debts", response_model=dict)
+@router.get("/{group_id}/debts", response_model=DebtsSummary, dependencies=[Depends(require_active_member)])
 def get_group_debts(
     group_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Ensure the user is a member of the group
-    member_check = db.query(GroupMember).filter(
-        GroupMember.user_id == current_user.id, GroupMember.group_id == group_id, GroupMember.status == "active"
-    ).first()
-    if not member_check:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You must be an active member of the group to view debts")
-
-    # Get all debts where the user is the debtor in the group
-    debts = db.query(GroupDebt).filter(
-        GroupDebt.debtor_id == current_user.id,
-        GroupDebt.group_id == group_id,
-        GroupDebt.status == "active",
-    ).all()
+    # Get all debts where the user is the debtor in the group, with the
+    # total computed by a window function so one query returns both
+    debts = (
+        db.query(
+            GroupDebt.creditor_id,
+            GroupDebt.amount,
+            GroupDebt.description,
+            func.sum(GroupDebt.amount).over().label("total"),
+        )
+        .filter(
+            GroupDebt.debtor_id == current_user.id,
+            GroupDebt.group_id == group_id,
+            GroupDebt.status == "active",
+        )
+        .all()
+    )
 
     debt_summary = {
-        "total_owe": sum(debt.amount for debt in debts),
+        "total_owe": debts[0].total if debts else 0,
         "debts": [{"from_user": debt.creditor_id, "amount": debt.amount, "description": debt.description} for debt in debts],
     }
 
@@ -1,7 +1,9 @@
 # app/routers/groups.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
+from sqlalchemy import delete, exists, insert, update
 from sqlalchemy.orm import Session
+import orjson
 from app.schemas import (
     GroupMemberStatus,
     Groups,
@@ -17,17 +19,25 @@ from app.models import (
     User, 
     Group, 
     GroupMember,
-    NotificationType
+    GroupMemberRole,
+    GroupMemberState
 )
-from app.database import get_db
+from app.database import get_db, insert_on_conflict
+from app.background_tasks import notify_group_invitation
 from app.routers.auth import get_current_user
 from app.utils import (
     logger, 
+    cache_get,
+    cache_set,
     get_group_by_id, 
     log_exception,
     check_group_membership,
-    get_member_model,
-    send_notification
+    check_manager_role,
+    is_active_member,
+    invalidate_membership_cache,
+    group_details_cache_key,
+    user_groups_cache_key,
+    GROUP_CACHE_TTL
 )
 
 router = APIRouter()
@@ -40,27 +50,36 @@ def create_group(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    existing_group = db.query(Group).filter(Group.name == group.name).first()
-    if existing_group:
+    # Create the group atomically, letting the unique name decide whether it already exists
+    new_group = db.execute(
+        insert_on_conflict(Group)
+        .values(name=group.name)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(Group)
+    ).scalar_one_or_none()
+    if not new_group:
         log_exception(
             log_level="warning",
             log_message=f"Attempt to create group with existing name '{group.name}' by '{current_user.username}'",
             status_raised=status.HTTP_400_BAD_REQUEST,
             exception_message="Group name already exists",
         )
-    new_group = Group(name=group.name)
-    db.add(new_group)
-    db.commit()
-    db.refresh(new_group)
 
-    # Add current user as a manager of the group
-    group_member = GroupMember(
-        user_id=current_user.id, group_id=new_group.id, role="manager", status="active"
+    # Add current user as a manager of the group with a plain INSERT
+    db.execute(
+        insert(GroupMember).values(
+            user_id=current_user.id, group_id=new_group.id, role=GroupMemberRole.MANAGER, status=GroupMemberState.ACTIVE
+        )
     )
-    db.add(group_member)
-    db.commit()
+    db.commit()  # Single commit for the group and its manager membership
+    invalidate_membership_cache(new_group.id, current_user.id)
 
-    logger.info(f"Created group ID: {new_group.id} successfully for user '{current_user.username}' (ID: {current_user.id})")
+    logger.info(
+        "Created group ID: %s successfully for user '%s' (ID: %s)",
+        new_group.id,
+        current_user.username,
+        current_user.id,
+    )
     return new_group
 
 
@@ -69,14 +88,15 @@ def create_group(
 def add_member(
     group_id: int,
     member: GroupMemberCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    check_group_membership(group_id=group_id, user=current_user, db=db)
-    group = get_group_by_id(db=db, current_user=current_user, group_id=group_id)
+    current_member = check_group_membership(group_id=group_id, user=current_user, db=db)
+    group = current_member.group
 
     # Check if current user is manager of the group
-    get_member_model(db=db, user=current_user, group_id=group_id, manager=True)
+    check_manager_role(member=current_member, user=current_user, group_id=group_id)
 
     # Look up the user by email
     user = db.query(User).filter(User.email == member.email).first()
@@ -88,34 +108,40 @@ def add_member(
             exception_message="User with this email not found",
         )
 
-    # Check if user is already a member
-    get_member_model(db=db, user=user, group_id=group_id, check_if_not_exists=True)
-
-    # Create new member with the user's ID
-    new_member = GroupMember(
-        user_id=user.id, group_id=group_id, role="member", status="pending"
-    )
-    db.add(new_member)
+    # Create the pending membership unless the user already has one, in a single atomic statement
+    new_member = db.execute(
+        insert_on_conflict(GroupMember)
+        .values(user_id=user.id, group_id=group_id, role=GroupMemberRole.MEMBER, status=GroupMemberState.PENDING)
+        .on_conflict_do_nothing(index_elements=["user_id", "group_id"])
+        .returning(GroupMember)
+    ).scalar_one_or_none()
+    if not new_member:
+        log_exception(
+            log_level="warning",
+            log_message=f"User is already a member of group ID: {group_id}",
+            status_raised=status.HTTP_400_BAD_REQUEST,
+            exception_message=f"User '{user.username}' is already a member of the group"
+        )
     db.commit()
-    db.refresh(new_member)
-
-    # Send notification to new member
-    send_notification(
-        db=db, 
-        user_id=user.id, 
-        type=NotificationType.ALERT,
-        message=f"You've been invited to join group '{group.name}' by '{current_user.username}'. Please accept or reject the invitation."
+    invalidate_membership_cache(group_id, user.id)
+
+    # Notify the new member and the manager once the response has been sent
+    background_tasks.add_task(
+        notify_group_invitation,
+        group.name,
+        current_user.id,
+        current_user.username,
+        user.id,
+        user.username,
     )
 
-    # Send notification to manager
-    send_notification(
-        db=db, 
-        user_id=current_user.id, 
-        type=NotificationType.ALERT,
-        message=f"You've invited '{user.username}' to join group '{group.name}'."
+    logger.info(
+        "Added member ID: %s to group ID: %s successfully for user '%s' (ID: %s)",
+        new_member.user_id,
+        group.id,
+        current_user.username,
+        current_user.id,
     )
-
-    logger.info(f"Added member ID: {new_member.user_id} to group ID: {group.id} successfully for user '{current_user.username}' (ID: {current_user.id})")
     return new_member
 
 
@@ -126,26 +152,40 @@ def remove_member(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    check_group_membership(group_id=group_id, user=current_user, db=db)
     group = get_group_by_id(db=db, current_user=current_user, group_id=group_id)
 
-    # Check if user is already a member
-    existing_member = get_member_model(
-        db=db, 
-        user=current_user, 
-        group_id=group_id, 
-        active=True
-    )
-
-    db.delete(existing_member)
+    # Remove the user's active membership in a single DELETE ... RETURNING
+    existing_member = db.execute(
+        delete(GroupMember)
+        .where(
+            GroupMember.user_id == current_user.id,
+            GroupMember.group_id == group_id,
+            GroupMember.status == GroupMemberState.ACTIVE,
+        )
+        .returning(GroupMember.role)
+    ).first()
+    if not existing_member:
+        check_group_membership(group_id=group_id, user=current_user, db=db)
+        log_exception(
+            log_level="warning",
+            log_message=f"User '{current_user.username}' (ID: {current_user.id}) is not an active member of group ID: {group_id}.",
+            status_raised=status.HTTP_400_BAD_REQUEST,
+            exception_message=f"User '{current_user.username}' is not an active member of group ID: {group_id}"
+        )
     db.commit()
+    invalidate_membership_cache(group_id, current_user.id)
 
-    if existing_member.role == "manager":
+    if existing_member.role == GroupMemberRole.MANAGER:
+        member_user_ids = [member.user_id for member in group.group_members]
         db.delete(group)
         db.commit()
+        invalidate_membership_cache(group_id, *member_user_ids)
 
     logger.info(
-        f"Removed member ID: {current_user.id} from group ID: {group.id} successfully for user '{current_user.username}'"
+        "Removed member ID: %s from group ID: %s successfully for user '%s'",
+        current_user.id,
+        group.id,
+        current_user.username,
     )
     return {"detail": f"Deleted from group '{group.name}' successfully"}
 
@@ -156,17 +196,14 @@ def remove_group(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    check_group_membership(group_id=group_id, user=current_user, db=db)
-    group = get_group_by_id(db=db, current_user=current_user, group_id=group_id)
+    current_member = check_group_membership(group_id=group_id, user=current_user, db=db)
+    group = current_member.group
 
-    get_member_model(
-        db=db, 
-        user=current_user, 
-        group_id=group_id,
-        manager=True
-    )
+    check_manager_role(member=current_member, user=current_user, group_id=group_id)
+    member_user_ids = [member.user_id for member in group.group_members]
     db.delete(group)
     db.commit()
+    invalidate_membership_cache(group_id, *member_user_ids)
     return {"detail": f"Deleted group '{group.name}' successfully"}
 
 
@@ -177,50 +214,62 @@ def update_member_status(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    check_group_membership(group_id=status_sent.group_id, user=current_user, db=db)
-    member = get_member_model(db=db, user=current_user, group_id=status_sent.group_id)
+    # Only the invited user's own pending membership can change, so the filter
+    # below also covers the "invitation is not for you" case
+    pending_invitation = (
+        GroupMember.user_id == current_user.id,
+        GroupMember.group_id == status_sent.group_id,
+        GroupMember.status == GroupMemberState.PENDING,
+    )
 
-    if member.status != "pending":
+    # Accept with a single UPDATE ... RETURNING; a rejected invitation is removed outright
+    if status_sent.status == "accepted":
+        member = db.execute(
+            update(GroupMember)
+            .where(*pending_invitation)
+            .values(status=GroupMemberState.ACTIVE)
+            .returning(GroupMember)
+        ).scalar_one_or_none()
+    else:
+        member = db.execute(
+            delete(GroupMember)
+            .where(*pending_invitation)
+            .returning(GroupMember)
+        ).scalar_one_or_none()
+
+    if not member:
+        # Raises a 404/403 if the group does not exist or the user is not a member at all
+        check_group_membership(group_id=status_sent.group_id, user=current_user, db=db)
         logger.warning(
-            f"Pending invitation not found or already processed for group ID: {status_sent.group_id} for user '{current_user.username}' (ID: {current_user.id})"
+            "Pending invitation not found or already processed for group ID: %s for user '%s' (ID: %s)",
+            status_sent.group_id,
+            current_user.username,
+            current_user.id,
         )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Pending invitation not found"
         )
 
-    # Check if the current user is the member being invited
-    if member.user_id != current_user.id:
-        logger.warning(
-            f"User '{current_user.username}' (ID: {current_user.id}) is not the invited member in this request"
-        )
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="This invitation is not for you",
+    if status_sent.status != "accepted":
+        # The row is already deleted; detach it so the rejected status is only reported back
+        db.expunge(member)
+        member.status = GroupMemberState.REJECTED
+        logger.info(
+            "Removed member %s from group_id %s ",
+            member.id,
+            status_sent.group_id,
         )
 
-    # Update the status to "active" if the user accepts
-    member.status = "active" if status_sent.status == "accepted" else "rejected"
+    # Single commit for the status change or the removal of a rejected invite
     db.commit()
-    db.refresh(member)
-
-    rejected_member = (
-        db.query(GroupMember)
-        .filter(
-            GroupMember.user_id == current_user.id,
-            GroupMember.group_id == status_sent.group_id,
-            GroupMember.status == "rejected",
-        )
-        .first()
-    )
-    if rejected_member:
-        db.delete(rejected_member)
-        db.commit()
-        logger.info(
-            f"Removed member {rejected_member.id} from group_id {status_sent.group_id} "
-        )
+    invalidate_membership_cache(status_sent.group_id, current_user.id)
 
     logger.info(
-        f"Updated member status for user '{current_user.username}' (ID: {current_user.id}) to '{member.status}' in group ID: {member.group_id}"
+        "Updated member status for user '%s' (ID: %s) to '%s' in group ID: %s",
+        current_user.username,
+        current_user.id,
+        member.status.value,
+        member.group_id,
     )
     return member
 
@@ -235,48 +284,71 @@ def remove_member_as_manager(
     """
     Manager removes a member from the group.
     """
-    check_group_membership(group_id=group_id, user=current_user, db=db)
-    group = get_group_by_id(db=db, current_user=current_user, group_id=group_id)
+    current_member = check_group_membership(group_id=group_id, user=current_user, db=db)
+    group = current_member.group
 
     # Verify the current user is a manager in the group
-    manager_check = get_member_model(db=db, user=current_user, group_id=group_id, active=True, manager=True)
+    check_manager_role(member=current_member, user=current_user, group_id=group_id)
 
-    # Verify the member to be removed exists and is part of the group
-    member_to_remove = (
-        db.query(GroupMember)
-        .filter(
+    # Remove the active, non-manager member in a single DELETE ... RETURNING
+    removed_user_id = db.execute(
+        delete(GroupMember)
+        .where(
             GroupMember.id == member_id,
             GroupMember.group_id == group_id,
-            GroupMember.status == "active",
+            GroupMember.status == GroupMemberState.ACTIVE,
+            GroupMember.role != GroupMemberRole.MANAGER,
         )
-        .first()
-    )
-    if not member_to_remove:
+        .returning(GroupMember.user_id)
+    ).scalar_one_or_none()
+
+    if removed_user_id is None:
+        # Only work out why nothing was deleted on the failure path
+        is_manager = db.query(
+            exists().where(
+                GroupMember.id == member_id,
+                GroupMember.group_id == group_id,
+                GroupMember.status == GroupMemberState.ACTIVE,
+                GroupMember.role == GroupMemberRole.MANAGER,
+            )
+        ).scalar()
+
+        # Prevent removing another manager
+        if is_manager:
+            logger.warning(
+                "Manager '%s' (ID: %s) attempted to remove another manager (ID: %s) from group ID: %s.",
+                current_user.username,
+                current_user.id,
+                member_id,
+                group_id,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Cannot remove another manager from the group",
+            )
+
         logger.warning(
-            f"Member ID: {member_id} not found in group ID: {group_id} by manager '{current_user.username}' (ID: {current_user.id})."
+            "Member ID: %s not found in group ID: %s by manager '%s' (ID: %s).",
+            member_id,
+            group_id,
+            current_user.username,
+            current_user.id,
         )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Member not found in the group",
         )
 
-    # Prevent removing another manager
-    if member_to_remove.role == "manager":
-        logger.warning(
-            f"Manager '{current_user.username}' (ID: {current_user.id}) attempted to remove another manager (ID: {member_id}) from group ID: {group_id}."
-        )
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Cannot remove another manager from the group",
-        )
-
-    # Remove the member from the group
-    db.delete(member_to_remove)
     db.commit()
+    invalidate_membership_cache(group_id, removed_user_id)
 
     # Log the successful removal
     logger.info(
-        f"Manager '{current_user.username}' (ID: {current_user.id}) successfully removed member ID: {member_id} from group ID: {group_id}."
+        "Manager '%s' (ID: %s) successfully removed member ID: %s from group ID: %s.",
+        current_user.username,
+        current_user.id,
+        member_id,
+        group_id,
     )
 
     # Return a success response
@@ -289,46 +361,57 @@ def remove_member_as_manager(
 def get_all_groups_details_for_user(
     db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
 ):
-    member_ids = (
-        db.query(GroupMember.id).
-        filter(GroupMember.user_id == current_user.id)
-        .all()
-    )
-    group_ids = (
-        db.query(GroupMember.group_id)
-        .filter(GroupMember.user_id == current_user.id)
-        .all()
-    )
-    group_roles = (
-        db.query(GroupMember.role)
-        .filter(GroupMember.user_id == current_user.id)
-        .all()
-    )
-    group_statuses = (
-        db.query(GroupMember.status)
+    # Serve the serialized listing straight from the cache when available
+    cache_key = user_groups_cache_key(current_user.id)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # Fetch each membership together with its group name in a single join
+    memberships = (
+        db.query(
+            GroupMember.id,
+            GroupMember.group_id,
+            GroupMember.role,
+            GroupMember.status,
+            Group.name,
+        )
+        .join(Group, Group.id == GroupMember.group_id)
         .filter(GroupMember.user_id == current_user.id)
         .all()
     )
-    if group_ids:
-        group_list = []
-        for group_id in group_ids:
-            for group_role in group_roles:
-                for group_status in group_statuses:
-                    for member_id in member_ids:
-                        group_name = (
-                            db.query(Group.name).filter(Group.id == group_id[0]).first()
-                        )
-                        group_list.append(
-                            {
-                                "group_id": group_id[0],
-                                "group_role": group_role[0],
-                                "group_name": group_name[0],
-                                "member_status": group_status[0],
-                                "member_id": member_id[0],
-                            }
-                        )
-        logger.info(f"User '{current_user.username}' logged in successfully.")
-        return group_list
+    group_list = None
+    if memberships:
+        group_list = [
+            {
+                "group_id": membership.group_id,
+                "group_role": membership.role,
+                "group_name": membership.name,
+                "member_status": membership.status,
+                "member_id": membership.id,
+            }
+            for membership in memberships
+        ]
+        logger.info(
+            "User '%s' logged in successfully.",
+            current_user.username,
+        )
+    cache_set(cache_key, orjson.dumps(group_list), GROUP_CACHE_TTL)
+    return group_list
+
+
+# Ensures the user is an active member according to serialized (cached) group details
+def _check_cached_group_membership(group_details: bytes, current_user: User, group_id: int):
+    if not any(
+        member["user_id"] == current_user.id and member["status"] == "active"
+        for member in orjson.loads(group_details)["members"]
+    ):
+        log_exception(
+            log_level="warning",
+            log_message=f"User '{current_user.username}' (ID: {current_user.id}) is not an active member of group ID: {group_id}.",
+            status_raised=status.HTTP_400_BAD_REQUEST,
+            exception_message=f"User '{current_user.username}' is not an active member of group ID: {group_id}"
+        )
 
 
 # 8. Get group details
@@ -341,30 +424,68 @@ def get_group_details(
     """
     Get details of a specific group, including members and group name.
     """
-    group = get_group_by_id(db=db, current_user=current_user, group_id=group_id)
-
-    # Check if the current user is a member of the group
-    member = get_member_model(db=db, user=current_user, group_id=group_id, active=True)
+    # Serve the serialized details straight from the cache, still enforcing active membership
+    cache_key = group_details_cache_key(group_id)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        _check_cached_group_membership(cached, current_user, group_id)
+        return Response(content=cached, media_type="application/json")
+
+    # Select only the group name and the member columns the response needs, in one joined query
+    rows = (
+        db.query(
+            Group.name,
+            GroupMember.id.label("member_id"),
+            GroupMember.user_id,
+            User.username,
+            GroupMember.role,
+            GroupMember.status,
+        )
+        .outerjoin(GroupMember, GroupMember.group_id == Group.id)
+        .outerjoin(User, User.id == GroupMember.user_id)
+        .filter(Group.id == group_id)
+        .order_by(GroupMember.id)
+        .all()
+    )
+    if not rows:
+        log_exception(
+            log_level="warning",
+            log_message=f"Group ID: {group_id} not found for user '{current_user.username}' (ID: {current_user.id})",
+            status_raised=status.HTTP_404_NOT_FOUND,
+            exception_message=f"Group #{group_id} not found"
+        )
 
-    # Fetch all group members
-    members = db.query(GroupMember).filter(GroupMember.group_id == group_id).all()
-    member_list = []
-    for member in members:
-        username = db.query(User.username).filter(User.id == member.user_id).first()[0]
-        member_list.append(
-            {
-                "member_id": member.id,
-                "user_id": member.user_id,
-                "username": username,
-                "role": member.role,
-                "status": member.status,
-            }
+    # Check if the current user is an active member of the group
+    if not any(
+        row.user_id == current_user.id and row.status == GroupMemberState.ACTIVE
+        for row in rows
+    ):
+        log_exception(
+            log_level="warning",
+            log_message=f"User '{current_user.username}' (ID: {current_user.id}) is not an active member of group ID: {group_id}.",
+            status_raised=status.HTTP_400_BAD_REQUEST,
+            exception_message=f"User '{current_user.username}' is not an active member of group ID: {group_id}"
         )
 
+    member_list = [
+        {
+            "member_id": row.member_id,
+            "user_id": row.user_id,
+            "username": row.username,
+            "role": row.role,
+            "status": row.status,
+        }
+        for row in rows
+    ]
+
     # Build the response
-    group_details = {"id": group.id, "name": group.name, "members": member_list}
+    group_details = {"id": group_id, "name": rows[0].name, "members": member_list}
+    cache_set(cache_key, orjson.dumps(group_details), GROUP_CACHE_TTL)
 
     logger.info(
-        f"Fetched details for group ID: {group_id} successfully for user '{current_user.username}' (ID: {current_user.id})."
+        "Fetched details for group ID: %s successfully for user '%s' (ID: %s).",
+        group_id,
+        current_user.username,
+        current_user.id,
     )
     return group_details
@@ -1,14 +1,26 @@
 # app/routers/notifications.py
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import desc, func, update
+from sqlalchemy.orm import Session, raiseload
 from app.database import get_db
 from app.routers.auth import get_current_user
 from app.models.user import User
 from app.models.notification import Notification
-from app.schemas.notifications import NotificationResponse
-from app.utils import logger
+from app.schemas.notifications import (
+    NotificationResponse,
+    NotificationMarkRead,
+    NotificationUnreadCount,
+    notification_list_adapter
+)
+from app.utils import (
+    logger,
+    cache_hget,
+    cache_hset,
+    unread_notifications_cache_key,
+    invalidate_unread_notifications_cache,
+    UNREAD_NOTIFICATIONS_CACHE_TTL
+)
 
 # Create an instance of APIRouter for notification-related routes
 router = APIRouter()
@@ -23,13 +35,20 @@ def get_notifications(
         10, ge=1, le=100, description="Maximum number of notifications to return."
     ),
     offset: int = Query(0, ge=0, description="Number of notifications to skip."),
+    cursor_id: int | None = Query(
+        None, description="Only return notifications with an ID below this one (keyset pagination)."
+    ),
 ):
     """
-    Fetches all unread notifications for the authenticated user.
+    Fetches all unread notifications for the authenticated user, newest first.
 
     Args: \n
         db (Session): The database session to interact with the database.
         current_user (User): The currently authenticated user.
+        limit (int): The maximum number of notifications to return.
+        offset (int): The number of notifications to skip.
+        cursor_id (int | None): The ID of the last notification of the previous page;
+            pass it instead of an offset to page without rescanning skipped rows.
 
     Returns:
         list[NotificationResponse]: A list of unread notifications for the user.
@@ -37,26 +56,75 @@ def get_notifications(
     Raises:
         HTTPException: If no unread notifications are found.
     """
-    notifications = (
+    # Serve the serialized page straight from the cache when available
+    cache_key = unread_notifications_cache_key(current_user.id)
+    cache_field = f"page:{limit}:{offset}:{cursor_id}"
+    cached = cache_hget(cache_key, cache_field)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # The response needs no relationships, so make any lazy load during
+    # serialization fail loudly instead of issuing a query per row
+    query = (
         db.query(Notification)
-        .filter(Notification.user_id == current_user.id, Notification.is_read == False)
-        .order_by(desc(Notification.id))
-        .offset(offset)
-        .limit(limit)
-        .all()
+        .options(raiseload("*"))
+        .filter(Notification.user_id == current_user.id, Notification.is_read.is_(False))
     )
+    if cursor_id is not None:
+        query = query.filter(Notification.id < cursor_id)
+    notifications = query.order_by(desc(Notification.id)).offset(offset).limit(limit).all()
 
     # Log the fetched unread notifications
     logger.info(
-        f"Fetched {len(notifications)} unread notifications for user '{current_user.username}' (ID: {current_user.id})."
+        "Fetched %s unread notifications for user '%s' (ID: %s).",
+        len(notifications),
+        current_user.username,
+        current_user.id,
     )
 
     # If no unread notifications are found, return an empty list
     if not notifications:
         logger.warning(
-            f"No unread notifications found for user '{current_user.username}' (ID: {current_user.id})."
+            "No unread notifications found for user '%s' (ID: %s).",
+            current_user.username,
+            current_user.id,
         )
-    return notifications
+    # Serialize the rows directly; the response_model above only documents the shape
+    payload = notification_list_adapter.dump_json(
+        notification_list_adapter.validate_python(notifications, from_attributes=True)
+    )
+    cache_hset(cache_key, cache_field, payload, UNREAD_NOTIFICATIONS_CACHE_TTL)
+    return Response(content=payload, media_type="application/json")
+
+
+# Route to fetch the number of unread notifications, e.g. for a badge
+@router.get("/unread-count", response_model=NotificationUnreadCount)
+def get_unread_notification_count(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Fetches the number of unread notifications for the authenticated user.
+
+    Args: \n
+        db (Session): The database session to interact with the database.
+        current_user (User): The currently authenticated user.
+
+    Returns:
+        NotificationUnreadCount: The number of unread notifications for the user.
+    """
+    cache_key = unread_notifications_cache_key(current_user.id)
+    cached = cache_hget(cache_key, "count")
+    if cached is not None:
+        return {"unread_count": int(cached)}
+
+    unread_count = (
+        db.query(func.count(Notification.id))
+        .filter(Notification.user_id == current_user.id, Notification.is_read.is_(False))
+        .scalar()
+    )
+    cache_hset(cache_key, "count", str(unread_count), UNREAD_NOTIFICATIONS_CACHE_TTL)
+    return {"unread_count": unread_count}
 
 
 # Route to mark a specific notification as read
@@ -80,27 +148,32 @@ def mark_notification_as_read(
     Raises:
         HTTPException: If the notification is not found or does not belong to the user.
     """
-    notification = (
-        db.query(Notification)
-        .filter(
-            Notification.id == notification_id, Notification.user_id == current_user.id
-        )
-        .first()
-    )
+    # Mark the notification as read and fetch it back in a single UPDATE ... RETURNING
+    notification = db.execute(
+        update(Notification)
+        .where(Notification.id == notification_id, Notification.user_id == current_user.id)
+        .values(is_read=True)
+        .returning(Notification)
+    ).scalar_one_or_none()
 
     if not notification:
         logger.error(
-            f"Notification {notification_id} not found for user '{current_user.username}' (ID: {current_user.id})."
+            "Notification %s not found for user '%s' (ID: %s).",
+            notification_id,
+            current_user.username,
+            current_user.id,
         )
         raise HTTPException(status_code=404, detail="Notification not found")
 
-    notification.is_read = True  # Mark the notification as read
     db.commit()  # Commit the update to the database
-    db.refresh(notification)  # Refresh the notification object to get the updated state
+    invalidate_unread_notifications_cache(current_user.id)
 
     # Log the action of marking the notification as read
     logger.info(
-        f"Notification {notification_id} marked as read for user '{current_user.username}' (ID: {current_user.id})."
+        "Notification %s marked as read for user '%s' (ID: %s).",
+        notification_id,
+        current_user.username,
+        current_user.id,
     )
 
     return notification
@@ -124,27 +197,85 @@ def mark_all_notifications_as_read(
     Raises:
         HTTPException: If no unread notifications are found.
     """
-    # Query all unread notifications for the user
-    notifications = (
-        db.query(Notification)
-        .filter(Notification.user_id == current_user.id, Notification.is_read == False)
-        .all()
-    )
+    # Mark all unread notifications as read in a single UPDATE ... RETURNING
+    notifications = db.execute(
+        update(Notification)
+        .where(Notification.user_id == current_user.id, Notification.is_read.is_(False))
+        .values(is_read=True)
+        .returning(Notification)
+    ).scalars().all()
 
     if not notifications:
-        logger.warning(f"No unread notifications found for user {current_user.id}.")
+        logger.warning(
+            "No unread notifications found for user %s.",
+            current_user.id,
+        )
         raise HTTPException(status_code=404, detail="No unread notifications found")
 
-    # Mark all fetched notifications as read
-    for notification in notifications:
-        notification.is_read = True
-
     db.commit()  # Commit the updates to the database
+    invalidate_unread_notifications_cache(current_user.id)
 
     # Log the action of marking all notifications as read
     logger.info(
-        f"Marked all unread notifications as read for user '{current_user.username}' (ID: {current_user.id}). Total: {len(notifications)}."
+        "Marked all unread notifications as read for user '%s' (ID: %s). Total: %s.",
+        current_user.username,
+        current_user.id,
+        len(notifications),
     )
 
     # Return the list of updated notifications
     return notifications
+
+
+# Route to mark several notifications as read in one request
+@router.put("/mark-as-read", response_model=list[NotificationResponse])
+def mark_notifications_as_read(
+    notification_ids: NotificationMarkRead,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Marks the given notifications as read for the authenticated user.
+
+    Args: \n
+        notification_ids (NotificationMarkRead): The IDs of the notifications to mark as read.
+        db (Session): The database session to interact with the database.
+        current_user (User): The currently authenticated user.
+
+    Returns:
+        list[NotificationResponse]: The notifications that were marked as read.
+
+    Raises:
+        HTTPException: If none of the notifications are found for the user.
+    """
+    # Mark every listed notification the user owns as read in a single UPDATE ... RETURNING
+    notifications = db.execute(
+        update(Notification)
+        .where(
+            Notification.id.in_(notification_ids.ids),
+            Notification.user_id == current_user.id,
+        )
+        .values(is_read=True)
+        .returning(Notification)
+    ).scalars().all()
+
+    if not notifications:
+        logger.warning(
+            "None of the notifications %s found for user '%s' (ID: %s).",
+            notification_ids.ids,
+            current_user.username,
+            current_user.id,
+        )
+        raise HTTPException(status_code=404, detail="Notifications not found")
+
+    db.commit()  # Commit the updates to the database
+    invalidate_unread_notifications_cache(current_user.id)
+
+    logger.info(
+        "Marked %s notifications as read for user '%s' (ID: %s).",
+        len(notifications),
+        current_user.username,
+        current_user.id,
+    )
+
+    return notifications
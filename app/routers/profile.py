@@ -1,34 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
 from app.models import User
 from app.routers.auth import get_current_user
 from app.database import get_db
 from app.schemas.profile import UserProfile, ProfileResponse
 from app.utils.logging_config import logger
+from app.utils import (
+    cache_get,
+    cache_set,
+    profile_cache_key,
+    invalidate_profile_cache,
+    PROFILE_CACHE_TTL
+)
 
 router = APIRouter()
 
 @router.get("/", response_model=ProfileResponse)
 def get_profile(
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Retrieve the authenticated user's profile.
     """
-    logger.info(f"Profile retrieval initiated for user ID {current_user.id}.")
-    user = db.query(User).filter(User.id == current_user.id).first()
-    if not user:
-        logger.error(f"Profile retrieval failed: User with ID {current_user.id} not found in the database.")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found.",
-        )
+    logger.info(
+        "Profile retrieval initiated for user ID %s.",
+        current_user.id,
+    )
+
+    # Serve the serialized profile straight from the cache when available
+    cache_key = profile_cache_key(current_user.id)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
 
     logger.info(
-        f"Profile successfully retrieved for user ID {current_user.id} with username '{current_user.username}'."
+        "Profile successfully retrieved for user ID %s with username '%s'.",
+        current_user.id,
+        current_user.username,
     )
-    return user
+    # Serialize once and send the same bytes that are cached
+    payload = ProfileResponse.model_validate(current_user, from_attributes=True).model_dump_json()
+    cache_set(cache_key, payload, PROFILE_CACHE_TTL)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.put("/", response_model=UserProfile)
@@ -40,31 +53,22 @@ def update_profile(
     """
     Update the user profile with new details.
     """
-    logger.info(f"Profile update initiated for user ID {current_user.id}.")
-    user = db.query(User).filter(User.id == current_user.id).first()
-    if not user:
-        logger.error(f"Profile update failed: User with ID {current_user.id} not found in the database.")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found.",
-        )
-    
-    # Log the fields being updated
-    updated_fields = []
-    if profile.full_name:
-        user.full_name = profile.full_name
-        updated_fields.append("full_name")
-    if profile.phone_number:
-        user.phone_number = profile.phone_number
-        updated_fields.append("phone_number")
-    if profile.bio:
-        user.bio = profile.bio
-        updated_fields.append("bio")
-    
+    logger.info(
+        "Profile update initiated for user ID %s.",
+        current_user.id,
+    )
+    # Apply only the fields the client sent to the row get_current_user already loaded
+    changes = profile.model_dump(exclude_unset=True)
+    for key, value in changes.items():
+        setattr(current_user, key, value)
+    updated_fields = list(changes)
+
     db.commit()
-    db.refresh(user)
+    invalidate_profile_cache(current_user.id)
 
     logger.info(
-        f"Profile successfully updated for user ID {current_user.id}. Updated fields: {', '.join(updated_fields) if updated_fields else 'None'}."
+        "Profile successfully updated for user ID %s. Updated fields: %s.",
+        current_user.id,
+        ", ".join(updated_fields) if updated_fields else "None",
     )
-    return user
+    return current_user
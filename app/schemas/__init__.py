@@ -52,9 +52,16 @@ from .groups import (
     GroupMemberResponse,
     GroupResponse,
     GroupDetailResponse,
-    GroupMemberExpenseShare
+    GroupMemberExpenseShare,
+    DebtItem,
+    DebtsSummary
+)
+from .notifications import (
+    NotificationResponse,
+    NotificationMarkRead,
+    NotificationUnreadCount,
+    notification_list_adapter
 )
-from .notifications import NotificationResponse
 from .analytics import (
     ExpenseSummary,
     ExportData,
@@ -61,6 +61,15 @@ class GroupMemberExpenseShare(BaseModel):
     total_amount: float
     description: str
 
+class DebtItem(BaseModel):
+    from_user: int
+    amount: float
+    description: Optional[str] = None
+
+class DebtsSummary(BaseModel):
+    total_owe: float
+    debts: list[DebtItem]
+
 class GroupExpenses(BaseModel):
     id: int
     payer_id: int
@@ -1,6 +1,6 @@
 # app/schemas/notifications.py
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import datetime
 from app.models import NotificationType
 
@@ -22,3 +22,26 @@ class NotificationResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+# Built once at import so listings are validated and dumped to JSON in a single pydantic-core pass
+notification_list_adapter = TypeAdapter(list[NotificationResponse])
+
+
+class NotificationMarkRead(BaseModel):
+    """
+    Schema for marking several notifications as read in one request.
+
+    Attributes:
+        ids (list[int]): The IDs of the notifications to mark as read.
+    """
+    ids: list[int] = Field(..., min_length=1, max_length=500)
+
+
+class NotificationUnreadCount(BaseModel):
+    """
+    Schema for the number of unread notifications of a user.
+
+    Attributes:
+        unread_count (int): The number of unread notifications.
+    """
+    unread_count: int
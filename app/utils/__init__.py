@@ -7,10 +7,20 @@ from .security import (
     verify_access_token
 )  # Security functions
 from .logging_config import logger
+from .cache import cache_get, cache_set, cache_delete, cache_hget, cache_hset
 from .helpers import (
     log_exception,
     check_group_membership,
+    ensure_group_membership,
+    check_manager_role,
+    is_active_member,
+    invalidate_membership_cache,
+    group_details_cache_key,
+    user_groups_cache_key,
+    GROUP_CACHE_TTL,
     get_expense_model,
+    get_expense_etag,
+    etag_matches,
     existing_category_attribute,
     get_category_model_by_id,
     get_category_model_by_name,
@@ -18,5 +28,14 @@ from .helpers import (
     get_member_model,
     get_debt_model,
     send_notification,
+    unread_notifications_cache_key,
+    invalidate_unread_notifications_cache,
+    UNREAD_NOTIFICATIONS_CACHE_TTL,
     create_new_category,
+    get_debt_category_id,
+    invalidate_debt_category_cache,
+    DEBT_CATEGORY_NAME,
+    profile_cache_key,
+    invalidate_profile_cache,
+    PROFILE_CACHE_TTL,
 )
\ No newline at end of file
@@ -0,0 +1,79 @@
+# app/utils/cache.py
+
+import redis
+from app.config import settings
+from .logging_config import logger
+
+# Optional Redis cache. Caching is disabled when REDIS_URL is not set, and
+# any Redis error is treated as a cache miss so requests fall back to the database.
+redis_client = (
+    redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+    if settings.REDIS_URL
+    else None
+)
+
+
+def cache_get(key: str) -> bytes | None:
+    """
+    Returns the cached value for a key, or None on a miss or when caching is unavailable.
+    """
+    if redis_client is None:
+        return None
+    try:
+        return redis_client.get(key)
+    except redis.RedisError as e:
+        logger.warning(f"Cache read failed for key '{key}': {e}")
+        return None
+
+
+def cache_set(key: str, value: bytes | str, ttl: int):
+    """
+    Stores a value under a key for `ttl` seconds.
+    """
+    if redis_client is None:
+        return
+    try:
+        redis_client.setex(key, ttl, value)
+    except redis.RedisError as e:
+        logger.warning(f"Cache write failed for key '{key}': {e}")
+
+
+def cache_hget(key: str, field: str) -> bytes | None:
+    """
+    Returns one field of a cached hash, or None on a miss or when caching is unavailable.
+    """
+    if redis_client is None:
+        return None
+    try:
+        return redis_client.hget(key, field)
+    except redis.RedisError as e:
+        logger.warning(f"Cache read failed for key '{key}' field '{field}': {e}")
+        return None
+
+
+def cache_hset(key: str, field: str, value: bytes | str, ttl: int):
+    """
+    Stores one field of a cached hash and (re)sets the hash's expiry to `ttl` seconds,
+    so related values can be dropped together with a single `cache_delete`.
+    """
+    if redis_client is None:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hset(key, field, value)
+        pipe.expire(key, ttl)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Cache write failed for key '{key}' field '{field}': {e}")
+
+
+def cache_delete(*keys: str):
+    """
+    Removes the given keys from the cache.
+    """
+    if redis_client is None or not keys:
+        return
+    try:
+        redis_client.delete(*keys)
+    except redis.RedisError as e:
+        logger.warning(f"Cache invalidation failed for keys {keys}: {e}")
@@ -1,9 +1,19 @@
 from .notifications import (
     log_exception, 
-    send_notification
+    send_notification,
+    unread_notifications_cache_key,
+    invalidate_unread_notifications_cache,
+    UNREAD_NOTIFICATIONS_CACHE_TTL
 )
 from .groups import (
     check_group_membership,
+    ensure_group_membership,
+    check_manager_role,
+    is_active_member,
+    invalidate_membership_cache,
+    group_details_cache_key,
+    user_groups_cache_key,
+    GROUP_CACHE_TTL,
     get_member_model,
     get_group_by_id
 )
@@ -12,7 +22,15 @@ from .categories import (
     get_category_model_by_name,
     existing_category_attribute,
     create_new_category,
-    create_new_category_budget
+    create_new_category_budget,
+    get_debt_category_id,
+    invalidate_debt_category_cache,
+    DEBT_CATEGORY_NAME
 )
-from .expenses import get_expense_model
+from .profile import (
+    profile_cache_key,
+    invalidate_profile_cache,
+    PROFILE_CACHE_TTL
+)
+from .expenses import get_expense_model, get_expense_etag, etag_matches
 from .group_debt import get_debt_model
\ No newline at end of file
@@ -7,16 +7,26 @@ from app.models import (
 )
 from app.schemas import CategoryCreate
 from .notifications import log_exception
+from ..cache import cache_get, cache_set, cache_delete
 from calendar import monthrange
 from datetime import date
 from app.utils import logger
 
+# Name of the per-user category that debt payments are booked against
+DEBT_CATEGORY_NAME = "Group Debts"
+# How long a user's debt category id may be served from the cache
+DEBT_CATEGORY_CACHE_TTL = 3600
+
+
+def _debt_category_cache_key(user_id: int) -> str:
+    return f"user:{user_id}:debt_category"
+
 def existing_category_attribute(db:Session, user: User, category:CategoryCreate, attribute:str):
     # Check for existing category attribute
     if attribute == "name":
-        db_category_attribute = db.query(Category).filter(Category.user_id == user.id, Category.name == category.name).first()
+        db_category_attribute = db.query(db.query(Category).filter(Category.user_id == user.id, Category.name == category.name).exists()).scalar()
     if attribute == "description":
-        db_category_attribute = db.query(Category).filter(Category.user_id == user.id, Category.description == category.description).first()
+        db_category_attribute = db.query(db.query(Category).filter(Category.user_id == user.id, Category.description == category.description).exists()).scalar()
 
     if db_category_attribute:
         log_exception(
@@ -68,13 +78,15 @@ def create_new_category_budget(db: Session, new_category: Category, db_user: Use
     end_date = today.replace(day=monthrange(today.year, today.month)[1])  # End of current month
 
     # Check if a default budget exists for the category
-    existing_budget = db.query(CategoryBudget).filter(
-        CategoryBudget.category_id == new_category.id,
-        CategoryBudget.user_id == db_user.id,
-        CategoryBudget.status == "active",
-        CategoryBudget.start_date <= end_date,
-        CategoryBudget.end_date >= start_date,
-    ).first()
+    existing_budget = db.query(
+        db.query(CategoryBudget).filter(
+            CategoryBudget.category_id == new_category.id,
+            CategoryBudget.user_id == db_user.id,
+            CategoryBudget.status == "active",
+            CategoryBudget.start_date <= end_date,
+            CategoryBudget.end_date >= start_date,
+        ).exists()
+    ).scalar()
 
     if existing_budget:
         logger.warning(f"An active budget already exists for category '{new_category.name}' (ID: {new_category.id}).")
@@ -89,7 +101,6 @@ def create_new_category_budget(db: Session, new_category: Category, db_user: Use
         )
         db.add(new_budget)
         db.commit()
-        db.refresh(new_budget)
         logger.info(f"Default budget created for category '{new_category.name}' with ID {new_budget.id}.")
 
 
@@ -102,7 +113,6 @@ def create_new_category(db:Session, category:CategoryCreate, db_user: User):
     )
     db.add(new_category)
     db.commit()
-    db.refresh(new_category)
 
     create_new_category_budget(
         db=db,
@@ -110,4 +120,26 @@ def create_new_category(db:Session, category:CategoryCreate, db_user: User):
         db_user=db_user
     )
     
-    return new_category
\ No newline at end of file
+    return new_category
+
+
+# Utility function to resolve the id of the user's debt category, served from
+# the cache after the first lookup. Returns None if the category does not exist.
+def get_debt_category_id(db: Session, user_id: int) -> int | None:
+    key = _debt_category_cache_key(user_id)
+    cached = cache_get(key)
+    if cached is not None:
+        return int(cached)
+
+    category_id = (
+        db.query(Category.id)
+        .filter(Category.name == DEBT_CATEGORY_NAME, Category.user_id == user_id)
+        .scalar()
+    )
+    if category_id is not None:
+        cache_set(key, str(category_id), DEBT_CATEGORY_CACHE_TTL)
+    return category_id
+
+# Utility function to drop the user's cached debt category id
+def invalidate_debt_category_cache(user_id: int):
+    cache_delete(_debt_category_cache_key(user_id))
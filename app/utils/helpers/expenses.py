@@ -1,3 +1,4 @@
+import hashlib
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from app.models import (
@@ -21,4 +22,23 @@ def get_expense_model(db:Session, expense_id:int, current_user: User, action:str
             exception_message=f"Expense ID: {expense_id} not found"
             )
     
-    return expense
\ No newline at end of file
+    return expense
+
+
+def get_expense_etag(expense: Expense) -> str:
+    """
+    Builds a weak ETag from the fields returned for an expense, so it
+    changes whenever any of them is updated.
+    """
+    fingerprint = f"{expense.id}|{expense.amount}|{expense.name}|{expense.date}|{expense.category_id}"
+    return f'W/"{hashlib.sha1(fingerprint.encode()).hexdigest()}"'
+
+
+def etag_matches(etag: str, if_none_match: str | None) -> bool:
+    """
+    Checks an If-None-Match header value against the given ETag.
+    """
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
@@ -1,28 +1,103 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import exists
+from sqlalchemy.orm import Session, joinedload
 from app.models import (
     GroupMember,
+    GroupMemberRole,
+    GroupMemberState,
     User, 
     Group,
     Expense,
     Category
 )
 from .notifications import log_exception
+from ..cache import cache_get, cache_set, cache_delete
 
-# Utility function to check if the user is part of the group
-def check_group_membership(group_id: int, user: User, db: Session):
-    group = db.query(Group).filter(Group.id == group_id).first()
-    if not group:
+# How long a membership check result may be served from the cache
+MEMBERSHIP_CACHE_TTL = 60
+# How long serialized group details and group listings may be served from the cache
+GROUP_CACHE_TTL = 15
+
+
+def _membership_cache_key(user_id: int, group_id: int) -> str:
+    return f"group_member_active:{user_id}:{group_id}"
+
+def group_details_cache_key(group_id: int) -> str:
+    return f"group:{group_id}:details"
+
+def user_groups_cache_key(user_id: int) -> str:
+    return f"user:{user_id}:groups"
+
+# Utility function to check if the user is part of the group.
+# Returns the user's membership row so callers can reuse it (and its
+# already-loaded `group`) instead of querying the membership again.
+def check_group_membership(group_id: int, user: User, db: Session) -> GroupMember:
+    # Fetch the membership together with its group in a single joined query
+    member = (
+        db.query(GroupMember)
+        .options(joinedload(GroupMember.group))
+        .filter(GroupMember.user_id == user.id, GroupMember.group_id == group_id)
+        .first()
+    )
+    if not member:
+        _raise_membership_error(group_id, db)
+    return member
+
+# Utility function to check the user is part of the group when the membership row is not needed
+def ensure_group_membership(group_id: int, user: User, db: Session):
+    is_member = db.query(
+        exists().where(GroupMember.user_id == user.id, GroupMember.group_id == group_id)
+    ).scalar()
+    if not is_member:
+        _raise_membership_error(group_id, db)
+
+def _raise_membership_error(group_id: int, db: Session):
+    # Only tell a missing group apart from a non-member on the failure path
+    if not db.query(exists().where(Group.id == group_id)).scalar():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
             detail="Group not found"
             )
-    # Check if the user is a member of the group
-    if not any(member.user_id == user.id for member in group.group_members):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, 
-            detail="You are not a member of this group"
-            )
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN, 
+        detail="You are not a member of this group"
+        )
+
+# Utility function to ensure a membership row belongs to an active group manager
+def check_manager_role(member: GroupMember, user: User, group_id: int):
+    if member.role != GroupMemberRole.MANAGER or member.status != GroupMemberState.ACTIVE:
+        log_exception(
+            log_level="warning",
+            log_message=f"User '{user.username}' (ID: {user.id}) attempted to perform a sensitive action from group ID: {group_id} without manager privileges.",
+            status_raised=status.HTTP_403_FORBIDDEN,
+            exception_message="Only group managers can perform this action",
+        )
+
+# Utility function to check active membership without loading the member row
+def is_active_member(db: Session, user_id: int, group_id: int) -> bool:
+    key = _membership_cache_key(user_id, group_id)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached == b"1"
+
+    active = db.query(
+        exists().where(
+            GroupMember.user_id == user_id,
+            GroupMember.group_id == group_id,
+            GroupMember.status == GroupMemberState.ACTIVE
+        )
+    ).scalar()
+    cache_set(key, "1" if active else "0", MEMBERSHIP_CACHE_TTL)
+    return active
+
+# Utility function to drop cached membership checks, the group's cached details
+# and the affected users' cached group listings after a membership changes
+def invalidate_membership_cache(group_id: int, *user_ids: int):
+    cache_delete(
+        group_details_cache_key(group_id),
+        *(_membership_cache_key(user_id, group_id) for user_id in user_ids),
+        *(user_groups_cache_key(user_id) for user_id in user_ids),
+    )
 
 def get_group_by_id(db:Session, current_user:User, group_id:int):
     group = db.query(Group).filter(Group.id == group_id).first()
@@ -51,9 +126,9 @@ def get_member_model(
         )
     )
     if active:
-        query.filter(GroupMember.status=="active")
+        query = query.filter(GroupMember.status == GroupMemberState.ACTIVE)
     if manager:
-        query.filter(GroupMember.role=="manager")
+        query = query.filter(GroupMember.role == GroupMemberRole.MANAGER)
 
     member = query.first()
     if check_if_not_exists:
@@ -64,6 +139,7 @@ def get_member_model(
                 status_raised=status.HTTP_400_BAD_REQUEST,
                 exception_message=f"User '{user.username}' is already a member of the group"
             )
+        return None
     
     if not member:
         if manager:
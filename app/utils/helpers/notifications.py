@@ -5,6 +5,21 @@ from app.models import (
     NotificationType
 )
 from app.utils import logger
+from ..cache import cache_delete
+
+# How long a user's unread notification pages and count may be served from the cache
+UNREAD_NOTIFICATIONS_CACHE_TTL = 60
+
+
+# All cached unread pages and the unread count of a user live in one hash,
+# so a single delete invalidates them together
+def unread_notifications_cache_key(user_id: int) -> str:
+    return f"unread:notif:{user_id}"
+
+# Utility function to drop cached unread notifications after any of the users'
+# notifications are created or marked as read
+def invalidate_unread_notifications_cache(*user_ids: int):
+    cache_delete(*(unread_notifications_cache_key(user_id) for user_id in set(user_ids)))
 
 def send_notification(db: Session, user_id: int, type: NotificationType, message: str):
     notification = Notification(
@@ -14,6 +29,7 @@ def send_notification(db: Session, user_id: int, type: NotificationType, message
     )
     db.add(notification)
     db.commit()
+    invalidate_unread_notifications_cache(user_id)
 
 def log_exception(log_level:str = None, log_message: str = None, status_raised:int = None, exception_message: str = None):
     if log_level == "warning":
@@ -0,0 +1,12 @@
+from ..cache import cache_delete
+
+# How long a serialized profile may be served from the cache
+PROFILE_CACHE_TTL = 3600
+
+
+def profile_cache_key(user_id: int) -> str:
+    return f"profile:{user_id}"
+
+# Utility function to drop a user's cached profile after any of its fields change
+def invalidate_profile_cache(user_id: int):
+    cache_delete(profile_cache_key(user_id))
@@ -1,5 +1,7 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 # Configure logger
 log_formatter = logging.Formatter('[%(asctime)s] - %(levelname)s - %(message)s')
@@ -15,8 +17,14 @@ stream_handler = logging.StreamHandler()
 stream_handler.setFormatter(log_formatter)
 stream_handler.setLevel(logging.INFO)
 
+# Requests only enqueue their records; a listener thread does the file and
+# stdout writes so logging never blocks the request thread on I/O
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)  # Flush queued records on shutdown
+
 # Create and configure the logger
 logger = logging.getLogger("audit_logger")
 logger.setLevel(logging.INFO)
-logger.addHandler(file_handler)  # Write to file
-logger.addHandler(stream_handler)  # Write to stdout
+logger.addHandler(QueueHandler(log_queue))  # Hand records to the listener thread
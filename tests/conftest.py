@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite database before any app module reads the settings
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ.pop("REDIS_URL", None)
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-that-is-at-least-32-bytes")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test")
+os.environ.setdefault("GOOGLE_CLIENT_SECRET", "test")
+os.environ.setdefault("GOOGLE_REDIRECT_URI", "http://testserver/auth/google/callback")
+
+import pytest
+import sentry_sdk
+from fastapi.testclient import TestClient
+
+# Keep test runs from reporting to the production Sentry project
+sentry_sdk.init = lambda *args, **kwargs: None
+
+from app.main import app
+from app.database import Base, engine, SessionLocal
+
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(db):
+    # Not used as a context manager, so the lifespan (and its scheduler) never starts
+    return TestClient(app)
+
+
+@pytest.fixture
+def register_user(client):
+    def register(username: str):
+        """Registers and logs in a user, returning their auth headers and ID."""
+        response = client.post(
+            "/auth/register",
+            json={"username": username, "email": f"{username}@example.com", "password": "password123"},
+        )
+        assert response.status_code == 200, response.text
+        response = client.post(
+            "/auth/user/login",
+            json={"email": f"{username}@example.com", "password": "password123"},
+        )
+        assert response.status_code == 200, response.text
+        body = response.json()
+        return {"Authorization": f"Bearer {body['access_token']}"}, body["user_id"]
+
+    return register
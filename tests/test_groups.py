@@ -0,0 +1,69 @@
+from app.models import GroupDebt, GroupExpense, ExpenseSplit, GroupMember
+
+
+def create_group_with_member(client, register_user):
+    """Creates a group managed by alice with bob as an active member."""
+    alice, alice_id = register_user("alice")
+    bob, bob_id = register_user("bob")
+    group_id = client.post("/groups/", headers=alice, json={"name": "trip"}).json()["id"]
+    client.post(f"/groups/{group_id}/members", headers=alice, json={"email": "bob@example.com"})
+    response = client.put("/groups/members", headers=bob, json={"group_id": group_id, "status": "accepted"})
+    assert response.status_code == 200, response.text
+    return group_id, (alice, alice_id), (bob, bob_id)
+
+
+def test_duplicate_invite_returns_400(client, register_user, db):
+    alice, _ = register_user("alice")
+    _, bob_id = register_user("bob")
+    group_id = client.post("/groups/", headers=alice, json={"name": "trip"}).json()["id"]
+
+    first = client.post(f"/groups/{group_id}/members", headers=alice, json={"email": "bob@example.com"})
+    second = client.post(f"/groups/{group_id}/members", headers=alice, json={"email": "bob@example.com"})
+
+    assert first.status_code == 200
+    assert second.status_code == 400
+    assert db.query(GroupMember).filter(GroupMember.user_id == bob_id).count() == 1
+
+
+def test_split_total_mismatch_writes_nothing(client, register_user, db):
+    group_id, (alice, alice_id), (_, bob_id) = create_group_with_member(client, register_user)
+
+    response = client.post(
+        f"/group-expenses/{group_id}/expenses",
+        headers=alice,
+        json={
+            "expense": {"amount": 30, "description": "dinner"},
+            "splits": [{"user_id": alice_id, "amount": 10}, {"user_id": bob_id, "amount": 15}],
+        },
+    )
+
+    assert response.status_code == 400
+    assert db.query(GroupExpense).count() == 0
+    assert db.query(ExpenseSplit).count() == 0
+    assert db.query(GroupDebt).count() == 0
+
+
+def test_group_expenses_cursor_pagination(client, register_user):
+    group_id, (alice, alice_id), (_, bob_id) = create_group_with_member(client, register_user)
+    for amount in (10, 20, 30):
+        response = client.post(
+            f"/group-expenses/{group_id}/expenses",
+            headers=alice,
+            json={
+                "expense": {"amount": amount, "description": f"expense {amount}"},
+                "splits": [{"user_id": alice_id, "amount": amount / 2}, {"user_id": bob_id, "amount": amount / 2}],
+            },
+        )
+        assert response.status_code == 200, response.text
+    url = f"/group-expenses/{group_id}/expenses"
+
+    ids = [expense["id"] for expense in client.get(url, headers=alice).json()]
+    assert ids == sorted(ids, reverse=True)
+
+    first_page = client.get(url, headers=alice, params={"limit": 2}).json()
+    assert [expense["id"] for expense in first_page] == ids[:2]
+    # The cursor itself is excluded, so the next page starts right after it
+    next_page = client.get(url, headers=alice, params={"limit": 2, "cursor_id": first_page[-1]["id"]}).json()
+    assert [expense["id"] for expense in next_page] == ids[2:]
+    # Nothing lies below the oldest expense
+    assert client.get(url, headers=alice, params={"cursor_id": ids[-1]}).json() == []
@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import insert
+
+import app.background_tasks.jobs.notification_batches as notification_batches
+from app.models import Notification, NotificationType
+
+
+def test_notifications_cursor_pagination(client, register_user, db):
+    headers, user_id = register_user("alice")
+    db.execute(
+        insert(Notification),
+        [
+            {"user_id": user_id, "type": NotificationType.SYSTEM, "message": f"notification {n}"}
+            for n in range(5)
+        ],
+    )
+    db.commit()
+
+    ids = [notification["id"] for notification in client.get("/notifications/", headers=headers).json()]
+    assert len(ids) == 5
+    assert ids == sorted(ids, reverse=True)
+
+    first_page = client.get("/notifications/", headers=headers, params={"limit": 2}).json()
+    assert [notification["id"] for notification in first_page] == ids[:2]
+    # The cursor itself is excluded, so the next page starts right after it
+    next_page = client.get(
+        "/notifications/", headers=headers, params={"limit": 2, "cursor_id": first_page[-1]["id"]}
+    ).json()
+    assert [notification["id"] for notification in next_page] == ids[2:4]
+    last_page = client.get(
+        "/notifications/", headers=headers, params={"limit": 2, "cursor_id": next_page[-1]["id"]}
+    ).json()
+    assert [notification["id"] for notification in last_page] == ids[4:]
+    # Nothing lies below the oldest notification
+    assert client.get("/notifications/", headers=headers, params={"cursor_id": ids[-1]}).json() == []
+
+
+def test_batch_flush_keeps_events_added_during_flush(client, register_user, db, monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeRedis()
+    monkeypatch.setattr(notification_batches, "redis_client", redis_client)
+    _, user_id = register_user("alice")
+    batch_key = notification_batches._batch_key(user_id, NotificationType.ALERT)
+
+    notification_batches.create_or_add_to_user_notification_batch(user_id, NotificationType.ALERT, "first")
+    notification_batches.create_or_add_to_user_notification_batch(user_id, NotificationType.ALERT, "second")
+    redis_client.delete(notification_batches._batch_open_key(batch_key))
+
+    # Append another event right after the flusher has read the batch
+    read_batch = redis_client.lrange
+
+    def lrange_then_append(*args):
+        events = read_batch(*args)
+        notification_batches.create_or_add_to_user_notification_batch(user_id, NotificationType.ALERT, "third")
+        return events
+
+    monkeypatch.setattr(redis_client, "lrange", lrange_then_append)
+    notification_batches.flush_notification_batches()
+
+    messages = [notification.message for notification in db.query(Notification).filter(Notification.user_id == user_id)]
+    assert messages == ["You have 2 new notifications: first | second"]
+    assert redis_client.lrange(batch_key, 0, -1) == [b"third"]
+    assert redis_client.sismember(notification_batches._BATCH_INDEX_KEY, batch_key)
+    assert not redis_client.exists(notification_batches._batch_claim_key(batch_key))